@@ -0,0 +1,67 @@
+"""Check that importing the CLI stays fast and free of heavy dependencies.
+
+Runs `python -X importtime -c "import dataops.cli"` in fresh interpreters and
+fails if the best run exceeds the budget or pulls in a module that only the
+data commands need:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 200 --runs 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# Only generate, check-quality, check-many and compact-results may load these
+HEAVY_MODULES = ["pandas", "numpy", "sqlalchemy", "faker", "uuid6", "pyarrow", "plotly", "streamlit"]
+
+
+def measure(module: str) -> dict:
+    """Cumulative import time in microseconds of every module loaded by one fresh import of module."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT / "src"), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings.setdefault(name.strip(), int(cumulative))
+    return timings
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="dataops.cli")
+    parser.add_argument("--budget-ms", type=float, default=300, help="allowed import time of the best run")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    # The module's own cumulative time covers everything it imported
+    totals = [timings[args.module] / 1000 for timings in runs]
+    best = min(range(len(runs)), key=lambda i: totals[i])
+    timings = runs[best]
+    print(f"import {args.module}: {totals[best]:.1f} ms best of {args.runs} (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    heavy = sorted(name for name in timings if name in HEAVY_MODULES)
+    if heavy:
+        print(f"FAIL heavy modules imported: {', '.join(heavy)}")
+        failed = True
+    if totals[best] > args.budget_ms:
+        print("FAIL over budget, slowest imports:")
+        failed = True
+    if failed:
+        slowest = sorted(timings.items(), key=lambda item: -item[1])[:10]
+        for name, cumulative in slowest:
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+import itertools
+import pickle
+import re
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+import pandas as pd
+from dataops.sketches import ApproxUniqueCounter
+
+
+class _Null:
+    """The one key every null (None, NaN, pd.NA, NaT) maps to.
+
+    Pickles back to the module-level instance, so spilled keys and keys from
+    worker processes still compare equal to it.
+    """
+
+    def __reduce__(self):
+        return "_NULL"
+
+    def __repr__(self):
+        return "<null>"
+
+
+_NULL = _Null()
+
+# Check name -> result metric, in the order metrics are reported
+CHECK_METRICS = {
+    "not_null": "nulls",
+    "regex": "invalid_format",
+    "range": "out_of_range",
+    "positive": "non_positive",
+    "unique": "duplicates",
+    "approx_unique": "approx_duplicates",
+}
+# Every reported metric, in order
+METRICS = [*CHECK_METRICS.values(), "approx_distinct"]
+# Python-only regex syntax that PostgreSQL's ARE and Arrow's RE2 flavours do not understand
+PYTHON_ONLY_REGEX = re.compile(r"\(\?P[<=]|\(\?<[=!]|\(\?[aiLmsux-]+[:)]|\\[1-9]")
+# Number of hash partitions unique keys are spilled/shuffled into
+SPILL_PARTITIONS = 64
+# Rough per-entry cost of a Python set slot on top of the key object itself
+_SET_ENTRY_OVERHEAD = 48
+
+
+def normalize_keys(values: pd.Series) -> list:
+    # NaN never equals itself, and None/NaN differ by chunk dtype, so all nulls share one key
+    return [_NULL if pd.isna(v) else v for v in values.tolist()]
+
+
+def stable_hash(key) -> int:
+    # Numeric hashes are not randomized per process, str/bytes hashes are
+    if isinstance(key, (int, float)):
+        return hash(key) & 0xFFFFFFFF
+    return zlib.crc32(repr(key).encode())
+
+
+class UniqueCounter:
+    """Exact distinct counter that spills keys to hash partitions on disk once it
+    grows past ``memory_budget`` bytes."""
+
+    def __init__(self, memory_budget: int = None, spill_dir: str = None, partitions: int = SPILL_PARTITIONS):
+        self.memory_budget = memory_budget
+        self.spill_dir = spill_dir
+        self.partitions = partitions
+        self.total = 0
+        self.keys = set()
+        self.key_bytes = 0
+        self.spill_path = None
+
+    def update(self, values: pd.Series):
+        keys = normalize_keys(values)
+        self.total += len(keys)
+        self._add(keys)
+
+    def merge(self, other: "UniqueCounter"):
+        self.total += other.total
+        if other.spill_path:
+            for i in range(other.partitions):
+                for batch in other.read_partition(i):
+                    self._add(batch)
+        self._add(other.keys)
+
+    def distinct(self) -> int:
+        if not self.spill_path:
+            return len(self.keys)
+        self.flush()
+        return sum(len(set().union(*self.read_partition(i))) for i in range(self.partitions))
+
+    def duplicates(self) -> int:
+        return self.total - self.distinct()
+
+    def flush(self):
+        if not self.keys:
+            return
+        if not self.spill_path:
+            self.spill_path = tempfile.mkdtemp(prefix="unique-", dir=self.spill_dir)
+        buckets = {}
+        for key in self.keys:
+            buckets.setdefault(stable_hash(key) % self.partitions, []).append(key)
+        for i, batch in buckets.items():
+            with open(_partition_file(self.spill_path, i), "ab") as f:
+                pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.keys = set()
+        self.key_bytes = 0
+
+    def read_partition(self, i: int):
+        if self.spill_path:
+            yield from read_spill_partition(self.spill_path, i)
+
+    def close(self):
+        if self.spill_path:
+            shutil.rmtree(self.spill_path, ignore_errors=True)
+            self.spill_path = None
+
+    def _add(self, keys):
+        before = len(self.keys)
+        self.keys.update(keys)
+        added = len(self.keys) - before
+        if added:
+            self.key_bytes += added * _estimate_key_size(keys)
+        if self.memory_budget is not None and self.key_bytes > self.memory_budget:
+            self.flush()
+
+
+def _partition_file(spill_path: str, i: int) -> str:
+    return f"{spill_path}/part-{i:04d}.pkl"
+
+
+def read_spill_partition(spill_path: str, i: int):
+    try:
+        with open(_partition_file(spill_path, i), "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+    except FileNotFoundError:
+        return
+
+
+def _estimate_key_size(keys) -> int:
+    sample = list(itertools.islice(keys, 64))
+    if not sample:
+        return _SET_ENTRY_OVERHEAD
+    return sum(sys.getsizeof(k) for k in sample) // len(sample) + _SET_ENTRY_OVERHEAD
+
+
+def is_approx(unique) -> bool:
+    return isinstance(unique, dict) and bool(unique.get("approx"))
+
+
+def is_exact_unique(checks: dict) -> bool:
+    unique = checks.get("unique")
+    return bool(unique) and not is_approx(unique)
+
+
+def _no_timer(check: str):
+    pass
+
+
+class FieldAccumulator:
+    """Mergeable running totals for the checks configured on one field."""
+
+    # Seconds spent per check, collected only when a profiler hands in a dict
+    timings = None
+
+    def __init__(self, field, unique_memory_budget: int = None, spill_dir: str = None):
+        self.name = field.name
+        self.type = field.type
+        self.checks = dict(field.checks)
+        self.regex = field.regex
+        self.rows = 0
+        self.counts = {}
+        for check, metric in CHECK_METRICS.items():
+            if check in ["unique", "approx_unique"] or check not in self.checks:
+                continue
+            if check in ["not_null", "positive"] and not self.checks[check]:
+                continue
+            if check == "range" and self.type not in ["integer", "float"]:
+                continue
+            self.counts[metric] = 0
+        self.unique = None
+        unique = self.checks.get("unique")
+        if is_approx(unique):
+            self.unique = ApproxUniqueCounter(unique.get("error", 0.01), unique.get("capacity", 10_000_000))
+        elif unique:
+            self.unique = UniqueCounter(unique_memory_budget, spill_dir)
+        self.approx_unique = None
+        approx_unique = self.checks.get("approx_unique")
+        if approx_unique:
+            options = approx_unique if isinstance(approx_unique, dict) else {}
+            self.approx_unique = ApproxUniqueCounter(options.get("error", 0.01), options.get("capacity", 10_000_000))
+
+    def update(self, series: pd.Series):
+        checks = self.checks
+        self.rows += len(series)
+        all_null = series.isnull().all()
+        tick = self._timer()
+
+        if "not_null" in checks and checks["not_null"]:
+            self._add("nulls", int(series.isnull().sum()))
+            tick("not_null")
+
+        if "regex" in checks:
+            if all_null:
+                invalid = len(series)
+            else:
+                invalid = int((~series.str.match(self.regex, na=False)).sum())
+            self._add("invalid_format", invalid)
+            tick("regex")
+
+        if "range" in checks and self.type in ["integer", "float"]:
+            min_val, max_val = checks["range"]
+            out_of_range = 0 if all_null else int(((series < min_val) | (series > max_val)).sum())
+            self._add("out_of_range", out_of_range)
+            tick("range")
+
+        if "positive" in checks and checks["positive"]:
+            self._add("non_positive", 0 if all_null else int((series <= 0).sum()))
+            tick("positive")
+
+        if self.unique is not None:
+            self.unique.update(series)
+            tick("unique")
+
+        if self.approx_unique is not None:
+            self.approx_unique.update(series)
+            tick("approx_unique")
+
+    def update_arrow(self, array):
+        """Arrow counterpart of update(), running what it can on Arrow compute kernels."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        checks = self.checks
+        self.rows += len(array)
+        all_null = array.null_count == len(array)
+        series = None
+        tick = self._timer()
+
+        if "not_null" in checks and checks["not_null"]:
+            self._add("nulls", array.null_count)
+            tick("not_null")
+
+        if "regex" in checks:
+            if all_null:
+                invalid = len(array)
+            elif PYTHON_ONLY_REGEX.search(self.regex.pattern):
+                series = array.to_pandas()
+                invalid = int((~series.str.match(self.regex, na=False)).sum())
+            else:
+                # RE2 searches anywhere, str.match anchors at the start; nulls never match
+                matched = pc.match_substring_regex(array, f"^(?:{checks['regex']})")
+                invalid = len(array) - (pc.sum(matched).as_py() or 0)
+            self._add("invalid_format", invalid)
+            tick("regex")
+
+        if "range" in checks and self.type in ["integer", "float"]:
+            min_val, max_val = checks["range"]
+            if pa.types.is_floating(array.type):
+                # An int bound past 2^53 cannot be compared to doubles as an int
+                min_val, max_val = float(min_val), float(max_val)
+            outside = pc.or_(pc.less(array, min_val), pc.greater(array, max_val))
+            self._add("out_of_range", 0 if all_null else pc.sum(outside).as_py() or 0)
+            tick("range")
+
+        if "positive" in checks and checks["positive"]:
+            self._add("non_positive", 0 if all_null else pc.sum(pc.less_equal(array, 0)).as_py() or 0)
+            tick("positive")
+
+        if self.unique is not None or self.approx_unique is not None:
+            if series is None:
+                # Nullable ints would become float64 and lose precision past 2^53
+                series = array.to_pandas(integer_object_nulls=pa.types.is_integer(array.type))
+            if self.unique is not None:
+                self.unique.update(series)
+                tick("unique")
+            if self.approx_unique is not None:
+                self.approx_unique.update(series)
+                tick("approx_unique")
+
+    def _timer(self):
+        if self.timings is None:
+            return _no_timer
+        timings = self.timings
+        last = time.perf_counter()
+
+        def tick(check: str):
+            nonlocal last
+            now = time.perf_counter()
+            timings[check] = timings.get(check, 0.0) + now - last
+            last = now
+        return tick
+
+    def merge(self, other: "FieldAccumulator"):
+        self.rows += other.rows
+        for metric, value in other.counts.items():
+            self._add(metric, value)
+        if self.unique is not None and other.unique is not None:
+            self.unique.merge(other.unique)
+        if self.approx_unique is not None and other.approx_unique is not None:
+            self.approx_unique.merge(other.approx_unique)
+
+    def result(self) -> dict:
+        field_results = dict(self.counts)
+        if self.unique is not None:
+            field_results["duplicates"] = self.unique.duplicates()
+        if self.approx_unique is not None:
+            field_results["approx_duplicates"] = self.approx_unique.duplicates()
+            field_results["approx_distinct"] = self.approx_unique.distinct()
+        return field_results
+
+    def close(self):
+        if self.unique is not None:
+            self.unique.close()
+
+    def _add(self, metric: str, value: int):
+        self.counts[metric] = self.counts.get(metric, 0) + value
+
+
+def accumulate_frames(
+    frames, fields: list, logger, unique_memory_budget: int = None, spill_dir: str = None, profiler=None
+) -> dict:
+    """Feed an iterable of DataFrames (or Arrow tables) into one FieldAccumulator per field present in the data."""
+    accumulators = None
+    rows = 0
+    try:
+        for df in frames:
+            arrow = hasattr(df, "column_names")
+            if accumulators is None:
+                accumulators = {}
+                columns = df.column_names if arrow else df.columns
+                for field in fields:
+                    if field.name not in columns:
+                        logger.warning(f"Field {field.name} not found in data")
+                        continue
+                    accumulators[field.name] = FieldAccumulator(field, unique_memory_budget, spill_dir)
+                    if profiler is not None:
+                        accumulators[field.name].timings = profiler.check_timings(field.name)
+            for field_name, accumulator in accumulators.items():
+                if arrow:
+                    accumulator.update_arrow(df.column(field_name))
+                else:
+                    accumulator.update(df[field_name])
+            rows += len(df)
+            logger.debug(f"Checked {rows} rows")
+    except BaseException:
+        for accumulator in (accumulators or {}).values():
+            accumulator.close()
+        raise
+    return accumulators or {}
@@ -0,0 +1,268 @@
+import pickle
+import shutil
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Only the standard library is imported here: the scheduler parses DAG files
+# repeatedly, so config, pandas and SQLAlchemy are loaded inside the tasks
+
+
+def _setup(verbose: bool = True) -> tuple:
+    from dataops.config import load_config
+    from dataops.logging import setup_logger
+    config = load_config()
+    return config, setup_logger(verbose, Path(config["log_dir"]) / "data_quality.log")
+
+
+def _partial_dir(config: dict, token: str) -> Path:
+    return Path(config["data_dir"]) / "dag_partials" / token
+
+
+def _targets(config: dict, manifest: str = None) -> list:
+    from dataops.manifest import load_manifest
+    manifest = manifest or config.get("airflow", {}).get("manifest")
+    if manifest:
+        return load_manifest(manifest)["targets"]
+    table_name = config.get("quality", {}).get("table_name", "data_table")
+    return [{"name": table_name, "source": "db", "table_name": table_name}]
+
+
+def _partitioned(target: dict) -> bool:
+    from dataops.arrow_source import is_parquet
+    # These modes need the whole source in one task
+    if target.get("incremental") or target.get("sample") or target.get("pushdown"):
+        return False
+    return not (target["source"] == "csv" and is_parquet(target["csv_path"]))
+
+
+def generate_data(rows: int = None):
+    from dataops.data import generate_synthetic_data
+    config, _ = _setup()
+    rows = config.get("airflow", {}).get("generate_rows", 100) if rows is None else rows
+    if rows:
+        generate_synthetic_data(rows, config, True)
+
+
+def plan_units(partitions: int = None, manifest: str = None) -> list:
+    """One unit of work per partition of every target, for the mapped check task.
+
+    Targets come from a check-many manifest (airflow.manifest) or default to
+    quality.table_name. Incremental, sampled, pushdown and Parquet targets are
+    a single unit with no partition spec. A target that cannot be planned
+    becomes one unit carrying its error, so the other targets still run.
+    """
+    from dataops.checks import load_plan
+    from dataops.engines import get_engine
+    from dataops.parallel import plan_partitions, present_fields
+    config, logger = _setup()
+    partitions = partitions or config.get("airflow", {}).get("partitions", 4)
+    engine = get_engine(config, read_only=True)
+    token = uuid.uuid4().hex
+    units = []
+    for number, target in enumerate(_targets(config, manifest)):
+        table_name = target.get("table_name", "data_table")
+        specs = [None]
+        try:
+            if _partitioned(target):
+                fields = present_fields(
+                    target["source"], engine, target.get("csv_path"), table_name,
+                    load_plan(target.get("checks_config")).fields, logger
+                )
+                if fields:
+                    specs = plan_partitions(target["source"], engine, target.get("csv_path"), table_name, partitions, logger)
+        except Exception as e:
+            logger.error(f"Target {target['name']} failed: {e}")
+            error = f"{type(e).__name__}: {e}"
+            units.append({"token": token, "number": number, "target": target, "index": 0, "spec": None, "error": error})
+            continue
+        logger.info(f"Target {target['name']}: {len(specs)} partitions")
+        units += [
+            {"token": token, "number": number, "target": target, "index": index, "spec": spec}
+            for index, spec in enumerate(specs)
+        ]
+    return units
+
+
+def check_unit(unit: dict) -> dict:
+    """Check one unit and leave its partial metrics in data_dir for the reduce task.
+
+    Errors are returned with the unit rather than raised, so one failing
+    partition does not hold up the reduce and alert tasks.
+    """
+    config, logger = _setup()
+    target = unit["target"]
+    if unit.get("error"):
+        return {**unit, "path": None, "rows": 0, "seconds": 0}
+    try:
+        path, rows, seconds = _check(unit, config, logger)
+    except Exception as e:
+        logger.error(f"Target {target['name']} partition {unit['index']} failed: {e}")
+        return {**unit, "path": None, "rows": 0, "seconds": 0, "error": f"{type(e).__name__}: {e}"}
+    logger.info(f"Target {target['name']} partition {unit['index']}: {rows} rows in {seconds:.2f}s")
+    return {**unit, "path": str(path), "rows": rows, "seconds": seconds}
+
+
+def _check(unit: dict, config: dict, logger) -> tuple:
+    from dataops.checks import load_plan
+    from dataops.engines import get_engine
+    from dataops.manifest import run_target
+    from dataops.parallel import check_partition, partition_rows, partition_task, present_fields
+    target = unit["target"]
+    if unit["spec"] is None:
+        run = run_target(target, config, logger)
+        partial, rows, seconds = run, run["rows"] or 0, run["duration"]
+    else:
+        table_name = target.get("table_name", "data_table")
+        plan = load_plan(target.get("checks_config"))
+        engine = get_engine(config, read_only=True)
+        fields = present_fields(target["source"], engine, target.get("csv_path"), table_name, plan.fields, logger)
+        # Spilled keys live with the partials, so the reduce task's cleanup removes both
+        spill_dir = _partial_dir(config, unit["token"]) / "spill"
+        spill_dir.mkdir(parents=True, exist_ok=True)
+        unique_memory_budget = int(config.get("quality", {}).get("unique_memory_mb", 256) * 1024 * 1024)
+        task = partition_task(
+            unit["index"], unit["spec"], target["source"], target.get("csv_path"), config, table_name, fields,
+            logger, target.get("chunk_size"), unique_memory_budget, str(spill_dir)
+        )
+        _, accumulators, seconds = check_partition(task)
+        rows = partition_rows(accumulators)
+        # Exact unique keys are already in spill_dir, so this pickle stays small
+        partial = {"accumulators": accumulators, "config_hash": plan.digest}
+    path = _partial_dir(config, unit["token"]) / f"{unit['number']:04d}-{unit['index']:05d}.pkl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        pickle.dump(partial, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path, rows, seconds
+
+
+def _merge_target(target: dict, group: list) -> dict:
+    from dataops.checks import load_plan
+    from dataops.parallel import merge_partitions, partition_rows
+    from dataops.quality import make_run
+    loaded = []
+    for partial in group:
+        with open(partial["path"], "rb") as f:
+            loaded.append(pickle.load(f))
+    if group[0]["spec"] is None:
+        return loaded[0]
+    outcomes = [item["accumulators"] for item in loaded]
+    try:
+        names = set().union(*outcomes)
+        fields = [field for field in load_plan(target.get("checks_config")).fields if field.name in names]
+        results = merge_partitions(fields, outcomes)
+    finally:
+        for accumulators in outcomes:
+            for accumulator in accumulators.values():
+                accumulator.close()
+    source_name = target.get("csv_path") if target["source"] == "csv" else target.get("table_name", "data_table")
+    rows = sum(partition_rows(accumulators) for accumulators in outcomes)
+    duration = max(partial["seconds"] for partial in group)
+    return make_run(source_name, results, loaded[0]["config_hash"], rows, duration)
+
+
+def reduce_results(partials: list, units: list = None) -> list:
+    """Merge the partial metrics of each target and save every run in one batched write.
+
+    A partitioned run's duration is its slowest partition, as partitions run
+    side by side. A target with a failed or missing partition (from units,
+    when the check task itself died) is not saved. Returns per-target
+    summaries (name, status, run_id, rows, failures, error). The partials
+    are deleted whether or not the merge succeeds.
+    """
+    from dataops.accumulators import CHECK_METRICS
+    from dataops.quality import save_runs
+    config, logger = _setup()
+    partials = sorted(partials, key=lambda partial: (partial["number"], partial["index"]))
+    expected = partials if units is None else units
+    targets = {unit["number"]: unit["target"] for unit in expected}
+    groups, errors = {}, {}
+    for partial in partials:
+        if partial.get("error"):
+            errors.setdefault(partial["number"], []).append(partial["error"])
+        else:
+            groups.setdefault(partial["number"], []).append(partial)
+    finished = {(partial["number"], partial["index"]) for partial in partials}
+    for unit in expected:
+        if (unit["number"], unit["index"]) not in finished:
+            errors.setdefault(unit["number"], []).append(f"partition {unit['index']} did not finish")
+
+    # approx_distinct is a cardinality, not a count of failing rows
+    failure_metrics = set(CHECK_METRICS.values())
+    summary, runs = [], []
+    try:
+        for number, target in sorted(targets.items()):
+            entry = {"name": target["name"], "status": "failed", "run_id": None, "rows": 0, "failures": {}}
+            summary.append(entry)
+            if number in errors:
+                entry["error"] = "; ".join(errors[number])
+                continue
+            try:
+                run = _merge_target(target, groups[number])
+            except Exception as e:
+                logger.error(f"Target {target['name']} failed: {e}")
+                entry["error"] = f"{type(e).__name__}: {e}"
+                continue
+            runs.append(run)
+            failures = {
+                field_name: {metric: value for metric, value in field_results.items() if value and metric in failure_metrics}
+                for field_name, field_results in run["results"].items()
+            }
+            entry.update(
+                status="ok", run_id=run["run_id"], rows=run["rows"] or 0,
+                failures={field_name: metrics for field_name, metrics in failures.items() if metrics},
+            )
+            logger.info(f"Target {target['name']}: merged {len(groups[number])} partitions, {entry['rows']} rows")
+        if runs:
+            save_runs(config, runs, logger)
+    finally:
+        if expected:
+            shutil.rmtree(_partial_dir(config, expected[0]["token"]), ignore_errors=True)
+    return summary
+
+
+def alert_results(summary: list):
+    """Send the run's report, then fail the task if any target could not be checked."""
+    from dataops.alert import send_alert
+    config, _ = _setup()
+    failing = [entry for entry in summary if entry["failures"] or entry.get("error")]
+    lines = []
+    for entry in summary:
+        if entry.get("error"):
+            lines.append(f"{entry['name']}: failed: {entry['error']}")
+            continue
+        lines.append(f"{entry['name']}: {entry['rows']} rows, run {entry['run_id']}")
+        for field_name, metrics in entry["failures"].items():
+            lines.append(f"  {field_name}: " + ", ".join(f"{metric}={value}" for metric, value in metrics.items()))
+    subject = f"Data Quality Report: {len(failing)} of {len(summary)} targets with failures" if failing else "Data Quality Report"
+    send_alert(subject, "\n".join(lines) or "Quality checks completed", config, True, wait=True)
+    errored = [entry["name"] for entry in summary if entry.get("error")]
+    if errored:
+        raise RuntimeError(f"Targets failed: {', '.join(errored)}")
+
+
+def build_dag(
+    dag_id: str = "data_quality_dag",
+    schedule: str = "@daily",
+    start_date: datetime = None,
+    partitions: int = None,
+    manifest: str = None,
+    generate_rows: int = None
+):
+    """Data quality DAG: generate, plan, a mapped check task per partition, reduce, alert.
+
+    Reduce and alert run once every check task has finished, failed or not.
+
+    partitions, manifest and generate_rows default to the airflow section of
+    config.yaml, read when the tasks run rather than when the DAG is parsed.
+    """
+    from airflow.sdk import DAG, task
+    with DAG(dag_id, start_date=start_date or datetime(2025, 6, 12), schedule=schedule, catchup=False) as dag:
+        generated = task(task_id="generate_data")(generate_data)(generate_rows)
+        units = task(task_id="plan_units")(plan_units)(partitions, manifest)
+        partials = task(task_id="check_quality")(check_unit).expand(unit=units)
+        # Run even when a check task died, so the partials are cleaned up and the failure is reported
+        summary = task(task_id="reduce_results", trigger_rule="all_done")(reduce_results)(partials, units)
+        task(task_id="send_alert", trigger_rule="all_done")(alert_results)(summary)
+        generated >> units
+    return dag
@@ -1,26 +1,285 @@
+import atexit
+import json
+import os
+import queue
 import smtplib
+import threading
+import time
+from concurrent.futures import Future
 from email.mime.text import MIMEText
-from dataops.logging import setup_logger
+from pathlib import Path
 from dotenv import load_dotenv
-import os
+from dataops.logging import setup_logger
+
+_STOP = object()
+
+_dispatchers = {}
+_lock = threading.Lock()
+
+
+class SMTPTransport:
+    """Sends messages over one SMTP session, logging in once and reconnecting only when the server drops it."""
+
+    def __init__(self, host: str, port: int, user: str = None, password: str = None, starttls: bool = True, timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.server = None
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except BaseException:
+            server.close()
+            raise
+        self.server = server
+
+    def send(self, message):
+        if self.server is None:
+            self._connect()
+        try:
+            self.server.send_message(message)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # A dead session is dropped so the retry opens a fresh one
+            self.reset()
+            raise
+
+    def reset(self):
+        if self.server is not None:
+            try:
+                self.server.close()
+            finally:
+                self.server = None
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.reset()
+
+
+class LogTransport:
+    """Writes messages to the log instead of sending them, for local runs."""
+
+    def __init__(self, logger):
+        self.logger = logger
+
+    def send(self, message):
+        self.logger.info(f"Alert to {message['To']}: {message['Subject']}\n{message.get_payload()}")
+
+    def close(self):
+        pass
+
+
+class AlertDispatcher:
+    """Queues alerts and delivers them from a background worker.
 
-def send_alert(subject: str, body: str, config: dict, verbose: bool):
-    logger = setup_logger(verbose, Path(config["log_dir"]))
+    Alerts repeating a subject within dedupe_window seconds are dropped.
+    Alerts arriving within digest_window seconds of each other are sent
+    as one digest (at most max_batch per message). Failed sends are retried
+    with exponential backoff over the same transport, which keeps its
+    session open between messages and is closed after idle_timeout seconds.
+    Each submission's outcome is kept on the Future submit returns; alerts
+    nobody waits on are only logged and counted when delivery fails.
+    """
+
+    def __init__(
+        self,
+        transport,
+        sender: str,
+        recipients: list,
+        logger,
+        dedupe_window: float = 300,
+        digest_window: float = 5,
+        max_batch: int = 50,
+        retries: int = 3,
+        backoff: float = 2.0,
+        idle_timeout: float = 60
+    ):
+        self.transport = transport
+        self.sender = sender
+        self.recipients = recipients
+        self.logger = logger
+        self.dedupe_window = dedupe_window
+        self.digest_window = digest_window
+        self.max_batch = max_batch
+        self.retries = retries
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self.sent = 0
+        self.suppressed = 0
+        self.failed = 0
+        self._queue = queue.Queue()
+        self._recent = {}
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="alert-dispatcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, subject: str, body: str) -> Future:
+        """Queue an alert; returns None when it duplicates a recent subject.
+
+        The returned Future completes once the alert is sent, and holds the
+        last send error if every retry failed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            last = self._recent.get(subject)
+            if last is not None and now - last < self.dedupe_window:
+                self.suppressed += 1
+                self.logger.debug(f"Suppressed duplicate alert: {subject}")
+                return None
+            self._recent[subject] = now
+            for stale in [s for s, seen in self._recent.items() if now - seen >= self.dedupe_window]:
+                del self._recent[stale]
+        outcome = Future()
+        self._queue.put((subject, body, outcome))
+        return outcome
+
+    def flush(self):
+        """Block until every queued alert has been sent or given up on."""
+        self._queue.join()
+
+    def close(self, timeout: float = None):
+        if self._worker.is_alive():
+            self._queue.put(_STOP)
+            self._worker.join(timeout)
+
+    def _message(self, batch: list):
+        if len(batch) == 1:
+            subject, body, _ = batch[0]
+        else:
+            subject = f"Data quality digest: {len(batch)} alerts"
+            body = "\n\n".join(f"== {alert_subject} ==\n{alert_body}" for alert_subject, alert_body, _ in batch)
+        message = MIMEText(body)
+        message["Subject"] = subject
+        message["From"] = self.sender
+        message["To"] = ", ".join(self.recipients)
+        return message
+
+    def _deliver(self, batch: list):
+        """Send one message for batch; returns the last error once retries are exhausted, else None."""
+        message = self._message(batch)
+        for attempt in range(self.retries + 1):
+            try:
+                self.transport.send(message)
+                self.sent += len(batch)
+                self.logger.info(f"Alert sent: {message['Subject']}")
+                return None
+            except Exception as e:
+                if attempt == self.retries:
+                    self.failed += len(batch)
+                    self.logger.error(f"Failed to send alert after {attempt + 1} attempts: {e}")
+                    return e
+                delay = self.backoff * 2 ** attempt
+                self.logger.warning(f"Alert send failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                self.transport.close()
+                continue
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.digest_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                error = self._deliver(batch)
+            except Exception as e:
+                error = e
+                self.logger.error(f"Failed to send alert: {e}")
+            for _, _, outcome in batch:
+                if error is None:
+                    outcome.set_result(None)
+                else:
+                    outcome.set_exception(error)
+                self._queue.task_done()
+        self.transport.close()
+
+
+def build_dispatcher(config: dict, logger) -> AlertDispatcher:
     load_dotenv()
-    smtp_user = os.getenv("SMTP_USER", "your_email@example.com")
-    smtp_password = os.getenv("SMTP_PASSWORD", "your_app_password")
-    
-    msg = MIMEText(body)
-    msg["Subject"] = subject
-    msg["From"] = smtp_user
-    msg["To"] = "recipient@example.com"
-    
-    try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.starttls()
-            server.login(smtp_user, smtp_password)
-            server.send_message(msg)
-        logger.info("Alert sent successfully")
-    except Exception as e:
-        logger.error(f"Failed to send alert: {e}")
-        raise
+    alerts = config.get("alerts", {})
+    user = os.getenv("SMTP_USER", alerts.get("user", "your_email@example.com"))
+    if alerts.get("transport", "smtp") == "log":
+        transport = LogTransport(logger)
+    else:
+        transport = SMTPTransport(
+            os.getenv("SMTP_HOST", alerts.get("host", "smtp.gmail.com")),
+            int(os.getenv("SMTP_PORT", alerts.get("port", 587))),
+            user,
+            os.getenv("SMTP_PASSWORD", alerts.get("password", "your_app_password")),
+            starttls=alerts.get("starttls", True),
+        )
+    return AlertDispatcher(
+        transport,
+        alerts.get("sender", user),
+        alerts.get("recipients", ["recipient@example.com"]),
+        logger,
+        dedupe_window=alerts.get("dedupe_window", 300),
+        digest_window=alerts.get("digest_window", 5),
+        max_batch=alerts.get("max_batch", 50),
+        retries=alerts.get("retries", 3),
+        backoff=alerts.get("backoff", 2.0),
+    )
+
+
+def get_dispatcher(config: dict, logger) -> AlertDispatcher:
+    """Return the process-wide dispatcher for config's alert settings, starting it on first use."""
+    key = json.dumps(config.get("alerts", {}), sort_keys=True, default=str)
+    with _lock:
+        dispatcher = _dispatchers.get(key)
+        if dispatcher is None:
+            dispatcher = _dispatchers[key] = build_dispatcher(config, logger)
+        return dispatcher
+
+
+def close_dispatchers(timeout: float = None):
+    with _lock:
+        dispatchers = list(_dispatchers.values())
+        _dispatchers.clear()
+    for dispatcher in dispatchers:
+        dispatcher.close(timeout)
+
+
+# Deliver whatever is still queued before the interpreter exits
+atexit.register(close_dispatchers)
+
+
+def send_alert(subject: str, body: str, config: dict, verbose: bool, wait: bool = False):
+    """Queue an alert for background delivery.
+
+    With wait, block until it has been handled and raise the send error if
+    delivery failed; without it, failures are only logged.
+    """
+    logger = setup_logger(verbose, Path(config["log_dir"]) / "data_quality.log")
+    dispatcher = get_dispatcher(config, logger)
+    outcome = dispatcher.submit(subject, body)
+    if wait:
+        dispatcher.flush()
+        if outcome is not None:
+            outcome.result()
@@ -0,0 +1,113 @@
+from pathlib import Path
+
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+
+
+def is_parquet(path: str) -> bool:
+    return Path(path).suffix.lower() in PARQUET_SUFFIXES
+
+
+def arrow_type(field_type: str):
+    import pyarrow as pa
+    return {
+        "string": pa.string(),
+        "integer": pa.int64(),
+        "float": pa.float64(),
+        # Timestamps parse both plain dates and datetimes
+        "date": pa.timestamp("s"),
+    }.get(field_type, pa.string())
+
+
+def _to_int64(array):
+    """Checked cast of integer text to int64, accepting the "48.0" pandas writes for nullable ints.
+
+    A column holding a value that is not a whole number is read as float64
+    instead, so the range and positive checks report it rather than the run failing.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    try:
+        return pc.cast(array, pa.int64())
+    except pa.ArrowInvalid:
+        pass
+    try:
+        # Drop a zero fraction as text, so large values never pass through float64
+        return pc.cast(pc.replace_substring_regex(array, r"\.0*$", ""), pa.int64())
+    except pa.ArrowInvalid:
+        return pc.cast(array, pa.float64())
+
+
+def _cast_integers(tables, names: list):
+    for table in tables:
+        for name in names:
+            if name in table.column_names:
+                index = table.column_names.index(name)
+                table = table.set_column(index, name, _to_int64(table.column(name)))
+        yield table
+
+
+def _rebatch(batches, chunk_size: int):
+    import pyarrow as pa
+    pending, rows = [], 0
+    for batch in batches:
+        pending.append(batch)
+        rows += batch.num_rows
+        if rows >= chunk_size:
+            yield pa.Table.from_batches(pending)
+            pending, rows = [], 0
+    if pending:
+        yield pa.Table.from_batches(pending)
+
+
+def _csv_columns(path: str, read_options, parse_options) -> list:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    with pa.input_stream(path, compression="detect") as stream:
+        return pacsv.open_csv(stream, read_options=read_options, parse_options=parse_options).schema.names
+
+
+def iter_arrow_tables(path: str, fields: list, chunk_size: int = None):
+    """Yield a CSV or Parquet file as Arrow tables holding only the configured fields.
+
+    CSV is parsed on Arrow's thread pool with each field read as the compact
+    type its config declares; .gz, .bz2 and .zst inputs are decompressed on
+    the fly. With chunk_size, tables of about chunk_size rows are streamed.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    if not path or not Path(path).exists():
+        raise ValueError("Valid CSV path required")
+    names = [field.name for field in fields]
+
+    if is_parquet(path):
+        parquet = pq.ParquetFile(path)
+        columns = [name for name in names if name in parquet.schema_arrow.names]
+        if chunk_size:
+            yield from _rebatch(parquet.iter_batches(batch_size=chunk_size, columns=columns), chunk_size)
+        else:
+            yield parquet.read(columns=columns, use_threads=True)
+        return
+
+    read_options = pacsv.ReadOptions(use_threads=True)
+    parse_options = pacsv.ParseOptions()
+    present = set(_csv_columns(path, read_options, parse_options))
+    # Integers are read as text and cast per table, so "48.0" is accepted without going through float64
+    integers = [field.name for field in fields if field.type == "integer" and field.name in present]
+    convert_options = pacsv.ConvertOptions(
+        include_columns=[name for name in names if name in present],
+        column_types={
+            field.name: pa.string() if field.name in integers else arrow_type(field.type)
+            for field in fields if field.name in present
+        },
+        # Empty cells are nulls, as in pandas
+        strings_can_be_null=True,
+    )
+    with pa.input_stream(path, compression="detect") as stream:
+        if chunk_size:
+            reader = pacsv.open_csv(stream, read_options=read_options, parse_options=parse_options, convert_options=convert_options)
+            yield from _cast_integers(_rebatch(reader, chunk_size), integers)
+        else:
+            table = pacsv.read_csv(stream, read_options=read_options, parse_options=parse_options, convert_options=convert_options)
+            yield from _cast_integers([table], integers)
@@ -0,0 +1,238 @@
+import hashlib
+import re
+import threading
+from dataclasses import dataclass, field as dataclass_field, replace
+from pathlib import Path
+from types import MappingProxyType
+import yaml
+from dataops.accumulators import CHECK_METRICS
+from dataops.config import config_hash
+
+# Used when no checks config is given
+DEFAULT_CHECKS_CONFIG = {
+    "fields": [
+        {"name": "id", "type": "string", "checks": {"not_null": True}},
+        {"name": "name", "type": "string", "checks": {"not_null": True}},
+        {"name": "email", "type": "string", "checks": {"regex": r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"}},
+        {"name": "age", "type": "integer", "checks": {"range": [18, 80]}},
+        {"name": "salary", "type": "integer", "checks": {"range": [30000, 120000]}}
+    ]
+}
+# Field types the generator and checks understand; any other type generates uuid7 strings
+FIELD_TYPES = ["string", "integer", "float", "date", "uuid"]
+
+_plans = {}
+_lock = threading.Lock()
+
+
+class ChecksConfigError(ValueError):
+    """Raised with every problem found in a checks config."""
+
+    def __init__(self, errors: list, source: str = None):
+        self.errors = errors
+        prefix = f"Invalid checks config {source}" if source else "Invalid checks config"
+        super().__init__(prefix + ":\n" + "\n".join(f"  - {error}" for error in errors))
+
+
+@dataclass(frozen=True)
+class FieldPlan:
+    """One validated field: its checks plus the compiled regex and typed range bounds."""
+
+    name: str
+    type: str
+    checks: MappingProxyType = dataclass_field(default_factory=lambda: MappingProxyType({}))
+    dtype: str = None
+    regex: re.Pattern = None
+    bounds: tuple = None
+
+    def __post_init__(self):
+        if not isinstance(self.checks, MappingProxyType):
+            object.__setattr__(self, "checks", MappingProxyType(dict(self.checks)))
+
+    def with_checks(self, checks: dict) -> "FieldPlan":
+        return replace(self, checks=MappingProxyType(dict(checks)))
+
+    def to_dict(self) -> dict:
+        spec = {"name": self.name, "type": self.type, "checks": dict(self.checks)}
+        if self.dtype:
+            spec["dtype"] = self.dtype
+        return spec
+
+    # mappingproxy does not pickle, and plans travel to worker processes
+    def __getstate__(self):
+        return {**self.__dict__, "checks": dict(self.checks)}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "checks", MappingProxyType(self.checks))
+
+
+@dataclass(frozen=True)
+class CheckPlan:
+    """A compiled checks config, safe to share between runs and threads."""
+
+    fields: tuple
+    config: MappingProxyType
+    digest: str
+    watermark_column: str = None
+
+    @property
+    def columns(self) -> list:
+        return [field.name for field in self.fields]
+
+    @property
+    def required_columns(self) -> frozenset:
+        return frozenset(self.columns)
+
+
+def _check_flag(errors: list, where: str, check: str, value):
+    if not isinstance(value, bool):
+        errors.append(f"{where}: {check} must be true or false")
+
+
+def _check_unique(errors: list, where: str, check: str, value):
+    if isinstance(value, bool):
+        return
+    if not isinstance(value, dict):
+        errors.append(f"{where}: {check} must be true, false or a mapping")
+        return
+    unknown = set(value) - {"approx", "error", "capacity"}
+    if unknown:
+        errors.append(f"{where}: unknown {check} options {', '.join(sorted(unknown))}")
+    error = value.get("error", 0.01)
+    if not isinstance(error, (int, float)) or not 0 < error < 1:
+        errors.append(f"{where}: {check}.error must be between 0 and 1")
+    capacity = value.get("capacity", 1)
+    if not isinstance(capacity, int) or capacity < 1:
+        errors.append(f"{where}: {check}.capacity must be a positive integer")
+
+
+def _compile_field(errors: list, i: int, spec) -> FieldPlan:
+    where = f"fields[{i}]"
+    if not isinstance(spec, dict):
+        errors.append(f"{where}: must be a mapping")
+        return None
+    name, field_type = spec.get("name"), spec.get("type")
+    if not isinstance(name, str) or not name:
+        errors.append(f"{where}: name is required")
+        return None
+    where = f"field {name}"
+    if field_type not in FIELD_TYPES:
+        errors.append(f"{where}: type must be one of {', '.join(FIELD_TYPES)}, got {field_type!r}")
+    # Type-specific complaints only make sense once the type itself is valid
+    numeric = field_type in ["integer", "float"] or field_type not in FIELD_TYPES
+    string = field_type == "string" or field_type not in FIELD_TYPES
+    checks = spec.get("checks") or {}
+    if not isinstance(checks, dict):
+        errors.append(f"{where}: checks must be a mapping")
+        return None
+    unknown = set(checks) - set(CHECK_METRICS)
+    if unknown:
+        errors.append(f"{where}: unknown checks {', '.join(sorted(unknown))}")
+    dtype = spec.get("dtype")
+    if dtype is not None and not isinstance(dtype, str):
+        errors.append(f"{where}: dtype must be a string")
+
+    regex = None
+    if "regex" in checks:
+        if not string:
+            errors.append(f"{where}: regex needs a string field")
+        try:
+            regex = re.compile(checks["regex"])
+        except (re.error, TypeError) as e:
+            errors.append(f"{where}: invalid regex {checks['regex']!r}: {e}")
+
+    bounds = None
+    if "range" in checks:
+        value = checks["range"]
+        cast = int if field_type == "integer" else float
+        if not numeric:
+            errors.append(f"{where}: range needs an integer or float field")
+        elif (
+            not isinstance(value, (list, tuple)) or len(value) != 2
+            or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value)
+        ):
+            errors.append(f"{where}: range must be [min, max]")
+        elif value[0] > value[1]:
+            errors.append(f"{where}: range min {value[0]} is above max {value[1]}")
+        elif field_type == "integer" and any(v != int(v) for v in value):
+            errors.append(f"{where}: range bounds must be whole numbers on an integer field")
+        else:
+            bounds = (cast(value[0]), cast(value[1]))
+
+    for check in ["not_null", "positive"]:
+        if check in checks:
+            _check_flag(errors, where, check, checks[check])
+    if "positive" in checks and not numeric:
+        errors.append(f"{where}: positive needs an integer or float field")
+    for check in ["unique", "approx_unique"]:
+        if check in checks:
+            _check_unique(errors, where, check, checks[check])
+
+    if bounds is not None:
+        checks = {**checks, "range": list(bounds)}
+    return FieldPlan(name, field_type, checks, dtype, regex, bounds)
+
+
+def compile_plan(checks_config: dict, source: str = None) -> CheckPlan:
+    """Validate a checks config and compile it, raising ChecksConfigError listing every problem."""
+    errors = []
+    if not isinstance(checks_config, dict):
+        raise ChecksConfigError(["top level must be a mapping with a fields list"], source)
+    fields = checks_config.get("fields")
+    if not isinstance(fields, list) or not fields:
+        errors.append("fields must be a non-empty list")
+        fields = []
+    plans, seen = [], set()
+    for i, spec in enumerate(fields):
+        plan = _compile_field(errors, i, spec)
+        if plan is None:
+            continue
+        if plan.name in seen:
+            errors.append(f"field {plan.name}: defined more than once")
+        seen.add(plan.name)
+        plans.append(plan)
+    watermark_column = checks_config.get("watermark_column")
+    if watermark_column is not None and not isinstance(watermark_column, str):
+        errors.append("watermark_column must be a column name")
+    if errors:
+        raise ChecksConfigError(errors, source)
+    return CheckPlan(
+        tuple(plans), MappingProxyType(checks_config), config_hash(checks_config), watermark_column
+    )
+
+
+def load_plan(checks_config_path: str = None) -> CheckPlan:
+    """Return the compiled plan for a checks YAML file, or for the default config.
+
+    Plans are cached by path and mtime, and by content hash, so repeated runs
+    in one process (DAG tasks, check-many) parse and compile each file once.
+    """
+    if not checks_config_path:
+        key = "<default>"
+        with _lock:
+            if key not in _plans:
+                _plans[key] = compile_plan(DEFAULT_CHECKS_CONFIG)
+            return _plans[key]
+
+    path = Path(checks_config_path).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        plan = _plans.get(key)
+    if plan is not None:
+        return plan
+    content = path.read_bytes()
+    content_key = hashlib.sha256(content).hexdigest()
+    with _lock:
+        plan = _plans.get(content_key)
+    if plan is None:
+        try:
+            checks_config = yaml.safe_load(content)
+        except yaml.YAMLError as e:
+            raise ChecksConfigError([f"not valid YAML: {e}"], str(checks_config_path))
+        plan = compile_plan(checks_config, str(checks_config_path))
+    with _lock:
+        _plans[key] = _plans[content_key] = plan
+    return plan
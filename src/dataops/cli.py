@@ -5,8 +5,10 @@ from pathlib import Path
 from dataops.config import load_config, save_default_config, get_project_root
 from dataops.utils import start_services, stop_services, check_status, tail_log
 from dataops.logging import setup_logger
-from dataops.data import generate_synthetic_data
-from dataops.quality import run_quality_checks
+from dataops.logtail import LEVELS
+
+# Commands import pandas/SQLAlchemy-backed modules when they run, so
+# status, logs, start and stop start up without loading them
 
 app = typer.Typer(help="Generic DataOps CLI for data quality pipelines")
 
@@ -90,13 +92,27 @@ def status(verbose: bool = False):
     check_status(config)
 
 @app.command()
-def logs(file: str = "data_quality", verbose: bool = False):
-    """Display logs: data_quality, webserver, scheduler, streamlit."""
+def logs(
+    file: str = "data_quality",
+    lines: int = None,
+    follow: bool = False,
+    level: str = None,
+    since: str = None,
+    verbose: bool = False
+):
+    """Display logs: data_quality, status, services, dashboard, webserver, scheduler, streamlit.
+
+    --since takes an age (30s, 15m, 2h, 1d) or an ISO date/time; --level keeps
+    records at or above DEBUG, INFO, WARNING, ERROR or CRITICAL.
+    """
     logger = setup_logger(verbose)
     config = load_config()
     log_dir = Path(config["log_dir"])
     log_paths = {
         "data_quality": log_dir / "data_quality.log",
+        "status": log_dir / "status.log",
+        "services": log_dir / "services.log",
+        "dashboard": log_dir / "dashboard.log",
         "webserver": log_dir / "webserver.log",
         "scheduler": log_dir / "scheduler.log",
         "streamlit": log_dir / "streamlit.log",
@@ -108,15 +124,30 @@ def logs(file: str = "data_quality", verbose: bool = False):
     if not log_file.exists():
         typer.echo(f"Log file {log_file} does not exist")
         raise typer.Exit(code=1)
-    tail_log(log_file)
+    if level and level.upper() not in LEVELS:
+        typer.echo(f"Invalid level. Options: {', '.join(LEVELS)}")
+        raise typer.Exit(code=1)
+    try:
+        tail_log(log_file, lines, follow, level, since)
+    except ValueError as e:
+        logger.error(f"Invalid --since {since}: {e}")
+        raise typer.Exit(code=1)
 
 @app.command()
-def generate(n: int = 100, verbose: bool = False):
+def generate(
+    n: int = 100,
+    checks_config: str = None,
+    chunk_size: int = 100_000,
+    seed: int = None,
+    workers: int = 1,
+    verbose: bool = False
+):
     """Generate synthetic data."""
+    from dataops.data import generate_synthetic_data
     logger = setup_logger(verbose)
     config = load_config()
     try:
-        generate_synthetic_data(n, config, verbose)
+        generate_synthetic_data(n, config, verbose, checks_config, chunk_size, seed, workers)
         typer.echo("Synthetic data generated")
     except Exception as e:
         logger.error(f"Data generation failed: {e}")
@@ -128,9 +159,19 @@ def check_quality(
     csv_path: str = None,
     table_name: str = "data_table",
     checks_config: str = None,
+    chunk_size: int = None,
+    pushdown: bool = False,
+    workers: int = 1,
+    incremental: bool = False,
+    watermark_column: str = None,
+    full_refresh: bool = False,
+    sample: int = None,
+    reader: str = None,
+    profile: bool = False,
     verbose: bool = False
 ):
     """Run data quality checks."""
+    from dataops.quality import run_quality_checks
     logger = setup_logger(verbose)
     config = load_config()
     if source == "csv" and not csv_path:
@@ -138,12 +179,61 @@ def check_quality(
         raise typer.Exit(code=1)
     try:
         results = run_quality_checks(
-            source, csv_path, config, verbose, table_name, checks_config
+            source, csv_path, config, verbose, table_name, checks_config, chunk_size, pushdown, workers,
+            incremental, watermark_column, full_refresh, sample, reader, profile
         )
         typer.echo(f"Quality Check Results: {results}")
     except Exception as e:
         logger.error(f"Quality check failed: {e}")
         raise typer.Exit(code=1)
 
+@app.command()
+def check_many(manifest: str, max_workers: int = None, verbose: bool = False):
+    """Run data quality checks for every target in a manifest."""
+    from dataops.manifest import run_manifest
+    logger = setup_logger(verbose)
+    config = load_config()
+    try:
+        summary = run_manifest(manifest, config, verbose, max_workers)
+    except Exception as e:
+        logger.error(f"Check-many failed: {e}")
+        raise typer.Exit(code=1)
+    typer.echo(f"{'target':30} {'status':8} {'rows':>12} {'seconds':>9} {'rows/s':>12}")
+    for entry in summary:
+        typer.echo(
+            f"{entry['name']:30} {entry['status']:8} {entry['rows']:>12} "
+            f"{entry.get('seconds', 0):>9.2f} {entry.get('rows_per_sec', 0):>12.0f}"
+        )
+    if any(entry["status"] != "ok" for entry in summary):
+        raise typer.Exit(code=1)
+
+@app.command()
+def validate_checks(checks_config: str, verbose: bool = False):
+    """Validate a checks config without running it."""
+    from dataops.checks import ChecksConfigError, load_plan
+    logger = setup_logger(verbose)
+    try:
+        plan = load_plan(checks_config)
+    except (OSError, ChecksConfigError) as e:
+        typer.echo(str(e))
+        raise typer.Exit(code=1)
+    except Exception as e:
+        logger.error(f"Could not parse {checks_config}: {e}")
+        raise typer.Exit(code=1)
+    typer.echo(f"{checks_config} is valid: {len(plan.fields)} fields, columns {', '.join(plan.columns)}")
+
+@app.command()
+def compact_results(retain_days: int = None, verbose: bool = False):
+    """Roll raw results older than --retain-days into daily aggregates."""
+    from dataops import results as results_store
+    logger = setup_logger(verbose)
+    config = load_config()
+    try:
+        removed = results_store.compact_results(config, verbose, retain_days)
+        typer.echo(f"Compacted {removed} raw results")
+    except Exception as e:
+        logger.error(f"Results compaction failed: {e}")
+        raise typer.Exit(code=1)
+
 if __name__ == "__main__":
     app()
@@ -1,8 +1,11 @@
+import hashlib
+import json
 import yaml
 from pathlib import Path
 import os
 from typing import Optional
 from dotenv import load_dotenv
+from dataops.logging import configure_logging
 
 def get_project_root() -> Path:
     return Path.cwd().absolute()
@@ -37,8 +40,13 @@ def load_config() -> dict:
     default_config["database"]["user"] = os.getenv("DB_USER", default_config["database"]["user"])
     default_config["database"]["password"] = os.getenv("DB_PASSWORD", default_config["database"]["password"])
     
+    configure_logging(default_config.get("logging"))
     return default_config
 
+def config_hash(value) -> str:
+    """Short stable digest of a JSON-serializable config value."""
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
 def save_default_config():
     project_root = get_project_root()
     config_path = project_root / ".dataops" / "config.yaml"
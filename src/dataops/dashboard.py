@@ -1,33 +1,53 @@
 import streamlit as st
-import pandas as pd
-from sqlalchemy import create_engine
+from datetime import datetime, time, timedelta
+from pathlib import Path
+from dataops import dashboard_queries as queries
+from dataops.engines import get_engine
 from dataops.logging import setup_logger
 import plotly.express as px
 
 def main(config: dict):
-    logger = setup_logger(False, Path(config["log_dir"]))
+    logger = setup_logger(False, Path(config["log_dir"]) / "dashboard.log")
     st.title("Data Quality Dashboard")
-    
-    db_type = config["database"]["type"]
-    if db_type == "sqlite":
-        engine = create_engine(f"sqlite:///{config['database']['path']}")
-    else:
-        engine = create_engine(
-            f"postgresql://{config['database']['user']}:{config['database']['password']}@{config['database']['host']}:{config['database']['port']}/{config['database']['name']}"
-        )
-    
+
+    engine = get_engine(config, read_only=True)
+    dashboard_config = config.get("dashboard", {})
+    ttl = dashboard_config.get("cache_ttl", queries.DEFAULT_TTL)
+    points = dashboard_config.get("chart_points", queries.DEFAULT_CHART_POINTS)
+    page_size = dashboard_config.get("page_size", 50)
+
     try:
-        with engine.connect() as conn:
-            df = pd.read_sql("SELECT date, metric, value FROM results ORDER BY date DESC", conn)
-        
-        if df.empty:
+        if not queries.has_results(engine):
+            st.write("No data available")
+            return
+        options = queries.filter_options(engine, ttl)
+        if options["end"] is None:
             st.write("No data available")
             return
-        
-        fig = px.line(df, x="date", y="value", color="metric", title="Data Quality Metrics Over Time")
-        st.plotly_chart(fig)
+
+        # Filters are pushed into SQL, only aggregated buckets come back
+        first, last = options["start"].date(), options["end"].date()
+        default_start = max(first, last - timedelta(days=30))
+        date_range = st.sidebar.date_input("Date range", (default_start, last), min_value=first, max_value=last)
+        start_day, end_day = date_range if len(date_range) == 2 else (date_range[0], date_range[0])
+        start, end = datetime.combine(start_day, time.min), datetime.combine(end_day, time.max)
+        fields = st.sidebar.multiselect("Fields", options["fields"])
+        metrics = st.sidebar.multiselect("Metrics", options["metrics"])
+        sampled = st.sidebar.checkbox("Sampled runs", help="Chart sampled runs, which store rates, instead of full runs")
+
+        df = queries.metric_series(engine, start, end, fields, metrics, points, ttl, sampled)
+        if df.empty:
+            st.write("No results in the selected range")
+        else:
+            df["series"] = df["field"] + " - " + df["metric"]
+            fig = px.line(df, x="bucket", y="value", color="series", title="Data Quality Metrics Over Time")
+            st.plotly_chart(fig)
+
         st.subheader("Recent Results")
-        st.dataframe(df.head(10))
+        page = st.number_input("Page", min_value=1, value=1, step=1) - 1
+        recent, total = queries.recent_results(engine, page, page_size, start, end, fields, metrics, ttl)
+        st.caption(f"{total} results, page {page + 1} of {max((total + page_size - 1) // page_size, 1)}")
+        st.dataframe(recent)
     except Exception as e:
         logger.error(f"Dashboard failed: {e}")
         st.error(f"Error: {e}")
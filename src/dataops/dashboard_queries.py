@@ -0,0 +1,179 @@
+import math
+import threading
+import time
+from datetime import datetime
+import pandas as pd
+from sqlalchemy import bindparam, inspect, text
+
+# Seconds a query result is reused before hitting the database again
+DEFAULT_TTL = 60
+# Points per series the trend chart is downsampled to, about one per few pixels
+DEFAULT_CHART_POINTS = 600
+# Smallest bucket the trend chart aggregates into
+MIN_BUCKET = 3600
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _cached(key: tuple, ttl: float, compute):
+    now = time.monotonic()
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and now - hit[0] < ttl:
+            return hit[1]
+    value = compute()
+    with _lock:
+        _cache[key] = (now, value)
+        # Drop expired entries so filter combinations don't pile up
+        for stale in [k for k, (stored, _) in _cache.items() if now - stored >= ttl]:
+            del _cache[stale]
+    return value
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
+
+
+def bucket_seconds(start: datetime, end: datetime, points: int = DEFAULT_CHART_POINTS) -> int:
+    """Bucket width giving at most about `points` buckets over [start, end]: whole hours, or whole days past one day."""
+    span = max((end - start).total_seconds(), 1)
+    seconds = max(math.ceil(span / points), MIN_BUCKET)
+    unit = 86400 if seconds > 86400 else 3600
+    return math.ceil(seconds / unit) * unit
+
+
+def _filters(start, end, fields, metrics, date_column: str = "date", suffix: str = "", sampled: bool = None) -> tuple:
+    clauses, params, expanding = [], {}, []
+    if sampled is not None:
+        clauses.append(f"sampled = :sampled{suffix}")
+        params[f"sampled{suffix}"] = sampled
+    if start is not None:
+        clauses.append(f"{date_column} >= :start{suffix}")
+        params[f"start{suffix}"] = start
+    if end is not None:
+        clauses.append(f"{date_column} <= :end{suffix}")
+        params[f"end{suffix}"] = end
+    if fields:
+        clauses.append("field IN :fields")
+        params["fields"] = list(fields)
+        expanding.append("fields")
+    if metrics:
+        clauses.append("metric IN :metrics")
+        params["metrics"] = list(metrics)
+        expanding.append("metrics")
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params, expanding
+
+
+def _query(sql: str, expanding: list):
+    query = text(sql)
+    if expanding:
+        query = query.bindparams(*[bindparam(name, expanding=True) for name in expanding])
+    return query
+
+
+def has_results(engine) -> bool:
+    return inspect(engine).has_table("results")
+
+
+def filter_options(engine, ttl: float = DEFAULT_TTL) -> dict:
+    """Fields, metrics and the date range present in the results store."""
+    def compute():
+        with engine.connect() as conn:
+            fields = [row[0] for row in conn.execute(text("SELECT DISTINCT field FROM results ORDER BY field"))]
+            metrics = [row[0] for row in conn.execute(text("SELECT DISTINCT metric FROM results ORDER BY metric"))]
+            first, last = conn.execute(text("SELECT MIN(date), MAX(date) FROM results")).one()
+            if inspect(conn).has_table("results_daily"):
+                daily_first = conn.execute(text("SELECT MIN(day) FROM results_daily")).scalar()
+                if daily_first is not None:
+                    first = min(pd.Timestamp(first), pd.Timestamp(daily_first)) if first is not None else daily_first
+        return {
+            "fields": fields,
+            "metrics": metrics,
+            "start": pd.Timestamp(first).to_pydatetime() if first is not None else None,
+            "end": pd.Timestamp(last).to_pydatetime() if last is not None else None,
+        }
+    return _cached(("options", str(engine.url)), ttl, compute)
+
+
+def metric_series(
+    engine,
+    start: datetime,
+    end: datetime,
+    fields: list = None,
+    metrics: list = None,
+    points: int = DEFAULT_CHART_POINTS,
+    ttl: float = DEFAULT_TTL,
+    sampled: bool = False
+) -> pd.DataFrame:
+    """Metric values averaged into time buckets sized so each series has about `points` points.
+
+    Aggregation runs in the database over the raw results plus any days
+    compacted into results_daily, so the cost is independent of how many
+    raw rows fall in the range. Sampled runs store rates rather than counts,
+    so the series covers either full runs or sampled ones. Returns bucket,
+    field, metric, value, min_value, max_value.
+    """
+    bucket = bucket_seconds(start, end, points)
+    key = ("series", str(engine.url), start, end, tuple(fields or ()), tuple(metrics or ()), bucket, sampled)
+
+    def compute():
+        if engine.dialect.name == "sqlite":
+            epoch = "CAST(strftime('%s', {}) AS INTEGER) / :bucket * :bucket"
+        else:
+            epoch = "CAST(floor(extract(epoch from CAST({} AS TIMESTAMP)) / :bucket) AS BIGINT) * :bucket"
+        where, params, expanding = _filters(start, end, fields, metrics, sampled=sampled)
+        parts = [
+            f"SELECT {epoch.format('date')} AS bucket, field, metric, value, value AS low, value AS high, 1 AS n "
+            f"FROM results{where}"
+        ]
+        with engine.connect() as conn:
+            if inspect(conn).has_table("results_daily"):
+                daily_where, daily_params, _ = _filters(
+                    start.date() if start else None, end.date() if end else None, fields, metrics, "day", "_day", sampled
+                )
+                parts.append(
+                    f"SELECT {epoch.format('day')} AS bucket, field, metric, avg_value, min_value, max_value, samples "
+                    f"FROM results_daily{daily_where}"
+                )
+                params.update(daily_params)
+            sql = f"""
+                SELECT bucket, field, metric,
+                       SUM(value * n) / SUM(n) AS value, MIN(low) AS min_value, MAX(high) AS max_value
+                FROM ({' UNION ALL '.join(parts)}) AS points
+                GROUP BY bucket, field, metric
+                ORDER BY bucket
+            """
+            df = pd.read_sql(_query(sql, expanding), conn, params={**params, "bucket": bucket})
+        df["bucket"] = pd.to_datetime(df["bucket"], unit="s")
+        return df
+    return _cached(key, ttl, compute)
+
+
+def recent_results(
+    engine,
+    page: int = 0,
+    page_size: int = 50,
+    start: datetime = None,
+    end: datetime = None,
+    fields: list = None,
+    metrics: list = None,
+    ttl: float = DEFAULT_TTL
+) -> tuple:
+    """One page of raw results, newest first, and the total number of matching rows."""
+    where, params, expanding = _filters(start, end, fields, metrics)
+    base = ("recent", str(engine.url), start, end, tuple(fields or ()), tuple(metrics or ()))
+
+    def count():
+        with engine.connect() as conn:
+            return conn.execute(_query(f"SELECT COUNT(*) FROM results{where}", expanding), params).scalar()
+
+    def rows():
+        sql = f"SELECT date, field, metric, value, sampled, run_id FROM results{where} ORDER BY date DESC LIMIT :limit OFFSET :offset"
+        with engine.connect() as conn:
+            return pd.read_sql(
+                _query(sql, expanding), conn, params={**params, "limit": page_size, "offset": page * page_size}
+            )
+    total = _cached(base + ("count",), ttl, count)
+    return _cached(base + (page, page_size), ttl, rows), total
@@ -1,85 +1,158 @@
 import pandas as pd
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from faker import Faker
-from sqlalchemy import create_engine, text
-import uuid6
+from sqlalchemy import text
+import time
 from pathlib import Path
-import yaml
-import random
-from datetime import datetime, timedelta
+from datetime import date
+from dataops.checks import load_plan
+from dataops.engines import get_engine
+from dataops.loader import bulk_load
 from dataops.logging import setup_logger
 
-def generate_synthetic_data(n: int, config: dict, verbose: bool, checks_config_path: str = None):
-    logger = setup_logger(verbose, Path(config["log_dir"]) / "data_quality.log")
+# Share of generated values left null for nullable fields
+NULL_RATE = 0.1
+# Distinct Faker values drawn per string pool
+POOL_SIZE = 10_000
+
+def build_pools(fields: list, seed: int = None, pool_size: int = POOL_SIZE) -> dict:
+    """Pre-generate the Faker values string columns are sampled from."""
     fake = Faker()
-    
-    # Load checks configuration
-    if checks_config_path:
-        with open(checks_config_path, "r") as f:
-            checks_config = yaml.safe_load(f)
-    else:
-        checks_config = {
-            "fields": [
-                {"name": "id", "type": "string", "checks": {"not_null": True}},
-                {"name": "name", "type": "string", "checks": {"not_null": True}},
-                {"name": "email", "type": "string", "checks": {"regex": r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"}},
-                {"name": "age", "type": "integer", "checks": {"range": [18, 80]}},
-                {"name": "salary", "type": "integer", "checks": {"range": [30000, 120000]}}
-            ]
-        }
-    
-    # Generate data based on fields
-    data = []
-    for _ in range(n):
-        row = {}
-        for field in checks_config.get("fields", []):
-            field_name = field["name"]
-            field_type = field["type"]
-            checks = field.get("checks", {})
-            
-            if field_type == "string":
-                if "regex" in checks and "email" in field_name.lower():
-                    value = fake.email()
-                else:
-                    value = fake.word() if random.random() > 0.1 else None
-            elif field_type == "integer":
-                if "range" in checks:
-                    min_val, max_val = checks["range"]
-                    value = random.randint(min_val, max_val) if random.random() > 0.1 else None
-                else:
-                    value = random.randint(1, 1000)
-            elif field_type == "float":
-                value = round(random.uniform(0, 1000), 2) if random.random() > 0.1 else None
-            elif field_type == "date":
-                value = fake.date_between(start_date="-10y", end_date="today") if random.random() > 0.1 else None
+    if seed is not None:
+        fake.seed_instance(seed)
+    pools = {}
+    for field in fields:
+        if field.type != "string":
+            continue
+        if field.regex is not None and "email" in field.name.lower():
+            pools[field.name] = np.array([fake.email() for _ in range(pool_size)], dtype=object)
+        else:
+            pools[field.name] = np.array([fake.word() for _ in range(pool_size)], dtype=object)
+    return pools
+
+def uuid7_strings(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Build n RFC 9562 uuid7 strings at once: 48-bit ms timestamp, version, variant, random bits."""
+    timestamp = np.uint64(time.time_ns() // 1_000_000)
+    rand_a = rng.integers(0, 1 << 12, n, dtype=np.uint64)
+    rand_b = rng.integers(0, 1 << 62, n, dtype=np.uint64)
+    words = np.empty((n, 2), dtype=">u8")
+    words[:, 0] = (timestamp << np.uint64(16)) | np.uint64(0x7000) | rand_a
+    words[:, 1] = np.uint64(0x8000000000000000) | rand_b
+    digits = np.frombuffer(words.tobytes().hex().encode(), dtype="S1").reshape(n, 32)
+    chars = np.full((n, 36), b"-", dtype="S1")
+    for start, stop, offset in [(0, 8, 0), (9, 13, 8), (14, 18, 12), (19, 23, 16), (24, 36, 20)]:
+        chars[:, start:stop] = digits[:, offset:offset + stop - start]
+    return chars.view("S36").ravel().astype(str).astype(object)
+
+def generate_chunk(fields: list, n: int, seed, pools: dict) -> pd.DataFrame:
+    """Generate n rows for the configured fields, one vectorized column at a time."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for field in fields:
+        field_name = field.name
+        field_type = field.type
+        checks = field.checks
+        nulls = rng.random(n) < NULL_RATE
+
+        if field_type == "string":
+            values = pools[field_name][rng.integers(0, len(pools[field_name]), n)]
+            if not ("regex" in checks and "email" in field_name.lower()):
+                values[nulls] = None
+            column = pd.Series(values, dtype=object)
+        elif field_type == "integer":
+            if field.bounds is not None:
+                min_val, max_val = field.bounds
+                column = pd.Series(pd.arrays.IntegerArray(rng.integers(min_val, max_val + 1, n), nulls))
             else:
-                value = str(uuid6.uuid7())
-            
-            row[field_name] = value
-        data.append(row)
-    
-    df = pd.DataFrame(data)
-    
+                column = pd.Series(rng.integers(1, 1001, n))
+        elif field_type == "float":
+            values = np.round(rng.uniform(0, 1000, n), 2)
+            values[nulls] = np.nan
+            column = pd.Series(values)
+        elif field_type == "date":
+            today = np.datetime64(date.today(), "D")
+            values = today - rng.integers(0, 3653, n).astype("timedelta64[D]")
+            values[nulls] = np.datetime64("NaT")
+            column = pd.Series(values)
+        else:
+            column = pd.Series(uuid7_strings(n, rng))
+
+        columns[field_name] = column
+    return pd.DataFrame(columns)
+
+def _generate_task(task: tuple) -> pd.DataFrame:
+    return generate_chunk(*task)
+
+def iter_synthetic_chunks(
+    n: int,
+    fields: list,
+    chunk_size: int = 100_000,
+    seed: int = None,
+    workers: int = 1
+):
+    """Yield n synthetic rows as DataFrames of up to chunk_size rows, in order.
+
+    Each chunk gets its own child seed, so a given seed, n and chunk_size
+    reproduce the same data however many workers run (uuid7 timestamps aside).
+    At most two chunks per worker are in flight at once.
+    """
+    sizes = [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    pools = build_pools(fields, seed)
+    tasks = [(fields, size, child, pools) for size, child in zip(sizes, seeds)]
+    if workers <= 1:
+        for task in tasks:
+            yield _generate_task(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(_generate_task, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def generate_synthetic_data(
+    n: int,
+    config: dict,
+    verbose: bool,
+    checks_config_path: str = None,
+    chunk_size: int = 100_000,
+    seed: int = None,
+    workers: int = 1
+):
+    logger = setup_logger(verbose, Path(config["log_dir"]) / "data_quality.log")
+
+    fields = load_plan(checks_config_path).fields
+
     data_dir = Path(config["data_dir"])
     data_dir.mkdir(parents=True, exist_ok=True)
-    df.to_csv(data_dir / "sample.csv", index=False)
-    logger.info(f"Saved synthetic data to {data_dir / 'sample.csv'}")
-    
-    db_type = config["database"]["type"]
-    if db_type == "sqlite":
-        engine = create_engine(f"sqlite:///{config['database']['path']}")
-    else:
-        engine = create_engine(
-            f"postgresql://{config['database']['user']}:{config['database']['password']}@{config['database']['host']}:{config['database']['port']}/{config['database']['name']}"
-        )
-    
+    csv_path = data_dir / "sample.csv"
+
+    engine = get_engine(config)
+
     with engine.connect() as conn:
         # Create table dynamically
-        columns = ", ".join([f"{field['name']} {field['type'].upper()}" for field in checks_config["fields"]])
+        columns = ", ".join([f"{field.name} {field.type.upper()}" for field in fields])
         conn.execute(text(f"""
             CREATE TABLE IF NOT EXISTS data_table (
                 {columns}
             )
         """))
-        df.to_sql("data_table", conn, if_exists="append", index=False)
         conn.commit()
-        logger.info(f"Inserted {n} rows into data_table")
+
+    # Stream chunks from the generator through the CSV into the bulk loader
+    chunks = _write_csv(iter_synthetic_chunks(n, fields, chunk_size, seed, workers), csv_path, logger)
+    rows = bulk_load(engine, "data_table", chunks, logger)
+    logger.info(f"Saved synthetic data to {csv_path}")
+    logger.info(f"Inserted {rows} rows into data_table")
+
+def _write_csv(chunks, csv_path: Path, logger):
+    for i, df in enumerate(chunks):
+        df.to_csv(csv_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        logger.debug(f"Generated chunk {i} ({len(df)} rows)")
+        yield df
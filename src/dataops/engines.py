@@ -0,0 +1,102 @@
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+# Applied to every new SQLite connection unless database.sqlite_pragmas overrides them
+DEFAULT_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "mmap_size": 268435456,
+    "cache_size": -65536,
+}
+
+_engines = {}
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=256)
+def _compiled(pattern: str):
+    return re.compile(pattern)
+
+
+def _sqlite_regexp(pattern, value):
+    # Mirrors pandas str.match(na=False): only strings can match, anchored at the start
+    return isinstance(value, str) and _compiled(pattern).match(value) is not None
+
+
+def register_sqlite_regexp(dbapi_connection):
+    dbapi_connection.create_function("regexp", 2, _sqlite_regexp, deterministic=True)
+
+
+def database_url(config: dict) -> str:
+    db = config["database"]
+    if db["type"] == "sqlite":
+        return f"sqlite:///{db['path']}"
+    return f"postgresql://{db['user']}:{db['password']}@{db['host']}:{db['port']}/{db['name']}"
+
+
+def _sqlite_setup(pragmas: dict):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+        register_sqlite_regexp(dbapi_connection)
+    return on_connect
+
+
+def get_engine(config: dict, read_only: bool = False):
+    """Return the shared, pooled engine for config's database.
+
+    Engines are cached per database config for the life of the process, so
+    repeated commands, DAG tasks and dashboard reruns reuse open connections.
+    With read_only, database.read_replica_url is used when it is set.
+    """
+    db = config["database"]
+    url = database_url(config)
+    if read_only and db.get("read_replica_url"):
+        url = db["read_replica_url"]
+    key = json.dumps({"url": url, "database": db}, sort_keys=True, default=str)
+    with _lock:
+        engine = _engines.get(key)
+        if engine is not None:
+            return engine
+        options = {}
+        parsed = make_url(url)
+        # In-memory SQLite gets a singleton pool, which takes no size options
+        if issubclass(parsed.get_dialect().get_pool_class(parsed), QueuePool):
+            options.update(pool_size=db.get("pool_size", 5), max_overflow=db.get("max_overflow", 10))
+        engine = create_engine(
+            url,
+            pool_pre_ping=db.get("pool_pre_ping", True),
+            pool_recycle=db.get("pool_recycle", 1800),
+            **options,
+        )
+        if engine.dialect.name == "sqlite":
+            pragmas = {**DEFAULT_SQLITE_PRAGMAS, **db.get("sqlite_pragmas", {})}
+            event.listen(engine, "connect", _sqlite_setup(pragmas))
+        _engines[key] = engine
+        return engine
+
+
+def dispose_engines(close: bool = True):
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose(close=close)
+        if close:
+            _engines.clear()
+
+
+def _after_fork():
+    # Pooled connections must not be shared with a forked child; let it open its own
+    global _lock
+    _lock = threading.Lock()
+    for engine in _engines.values():
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import pickle
+import shutil
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import text
+from dataops.accumulators import accumulate_frames
+from dataops.config import config_hash
+from dataops.sources import csv_dtypes, csv_header, db_projection, iter_csv_range, iter_frames
+
+# Bytes before a CSV watermark hashed to tell an append from a rewritten file
+FINGERPRINT_BYTES = 64 * 1024
+
+
+def state_dir(config: dict, source_id: str, fields: list, watermark_column: str = None) -> Path:
+    """Directory holding the persisted state for one source + checks config."""
+    digest = config_hash(
+        {"source": source_id, "fields": [field.to_dict() for field in fields], "watermark": watermark_column}
+    )
+    name = "".join(c if c.isalnum() or c in "-_" else "_" for c in Path(source_id).name)
+    return Path(config["data_dir"]) / "state" / f"{name}-{digest}"
+
+
+def load_state(path: Path):
+    state_file = path / "state.pkl"
+    if not state_file.exists():
+        return None
+    with open(state_file, "rb") as f:
+        return pickle.load(f)
+
+
+def save_state(path: Path, state: dict):
+    for accumulator in state["accumulators"].values():
+        # Keep state.pkl small once a key set has started living on disk
+        if accumulator.unique is not None and accumulator.unique.spill_path:
+            accumulator.unique.flush()
+    path.mkdir(parents=True, exist_ok=True)
+    tmp_file = path / "state.pkl.tmp"
+    with open(tmp_file, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, path / "state.pkl")
+
+
+def reset_state(path: Path):
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def csv_fingerprint(csv_path: str, offset: int) -> dict:
+    """Inode plus a hash of the bytes just before offset, which an append leaves unchanged."""
+    with open(csv_path, "rb") as f:
+        f.seek(max(offset - FINGERPRINT_BYTES, 0))
+        tail = f.read(min(offset, FINGERPRINT_BYTES))
+        return {"inode": os.fstat(f.fileno()).st_ino, "tail": hashlib.sha256(tail).hexdigest()}
+
+
+def _new_frames(source, engine, csv_path, table_name, chunk_size, watermark_column, watermark, fields):
+    """Return (frames, new_watermark) for the rows appended since watermark."""
+    if source == "csv":
+        # Append-only files: the watermark is the byte offset already checked
+        size = os.path.getsize(csv_path)
+        start = watermark or csv_header(csv_path)[1]
+        return iter_csv_range(csv_path, start, size, chunk_size, dtype=csv_dtypes(fields)), size
+
+    if watermark_column:
+        key = engine.dialect.identifier_preparer.quote(watermark_column)
+    elif engine.dialect.name == "sqlite":
+        key = "rowid"
+    else:
+        raise ValueError(f"Incremental checks on {engine.dialect.name} need a watermark column")
+    columns, dtype = db_projection(engine, table_name, fields)
+    # Bound the scan by the current high-water mark so rows appended mid-run wait for the next one
+    with engine.connect() as conn:
+        high = conn.execute(text(f"SELECT MAX({key}) FROM {table_name}")).scalar()
+    if high is None:
+        frames = iter_frames("db", engine, table_name=table_name, chunk_size=chunk_size, columns=columns, dtype=dtype)
+        return frames, watermark
+    where, params = f"{key} <= :high", {"high": high}
+    if watermark is not None:
+        where, params = f"{key} > :low AND {where}", {**params, "low": watermark}
+    frames = iter_frames(
+        "db", engine, table_name=table_name, chunk_size=chunk_size, where=where, params=params,
+        columns=columns, dtype=dtype
+    )
+    return frames, high
+
+
+def run_incremental(
+    source: str,
+    engine,
+    csv_path: str,
+    table_name: str,
+    fields: list,
+    config: dict,
+    logger,
+    chunk_size: int = None,
+    unique_memory_budget: int = None,
+    watermark_column: str = None,
+    full_refresh: bool = False,
+    profiler=None
+) -> dict:
+    """Check only the rows added since the last run and merge them into the stored state.
+
+    Returns cumulative results over everything checked so far and the number
+    of new rows checked in this run. full_refresh
+    discards the stored state and rescans the whole source.
+    """
+    source_id = csv_path if source == "csv" else table_name
+    if source == "csv" and (not csv_path or not Path(csv_path).exists()):
+        raise ValueError("Valid CSV path required")
+    path = state_dir(config, source_id, fields, watermark_column)
+    if full_refresh:
+        logger.info(f"Full refresh requested, discarding state in {path}")
+        reset_state(path)
+    state = load_state(path)
+    if state and source == "csv" and state["watermark"] is not None:
+        if os.path.getsize(csv_path) < state["watermark"]:
+            logger.warning(f"{csv_path} shrank since the last run, recomputing from scratch")
+            reset_state(path)
+            state = None
+        elif state.get("fingerprint") != csv_fingerprint(csv_path, state["watermark"]):
+            # Rewritten in place (dataops generate) or replaced by another file
+            logger.warning(f"{csv_path} was replaced since the last run, recomputing from scratch")
+            reset_state(path)
+            state = None
+    if state is None:
+        state = {"watermark": None, "rows": 0, "accumulators": {}}
+    path.mkdir(parents=True, exist_ok=True)
+
+    frames, watermark = _new_frames(
+        source, engine, csv_path, table_name, chunk_size, watermark_column, state["watermark"], fields
+    )
+    if profiler is not None:
+        frames = profiler.frames(frames)
+    new = accumulate_frames(frames, fields, logger, unique_memory_budget, str(path), profiler)
+    rows = max((accumulator.rows for accumulator in new.values()), default=0)
+    logger.info(f"Incremental run: {rows} new rows since watermark {state['watermark']}")
+
+    accumulators = state["accumulators"]
+    for field_name, accumulator in new.items():
+        if field_name in accumulators:
+            accumulators[field_name].merge(accumulator)
+            accumulator.close()
+        else:
+            accumulators[field_name] = accumulator
+
+    results = {field_name: accumulator.result() for field_name, accumulator in accumulators.items()}
+    if source == "csv":
+        state["fingerprint"] = csv_fingerprint(csv_path, watermark)
+    state.update(
+        watermark=watermark,
+        rows=state["rows"] + rows,
+        updated=datetime.now().isoformat(),
+    )
+    save_state(path, state)
+    logger.info(f"Saved watermark {watermark} ({state['rows']} rows checked in total)")
+    return results, rows
@@ -1,20 +1,165 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 from pathlib import Path
 
-def setup_logger(verbose: bool, log_dir: Path = None):
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+DEFAULT_LOG_FILE = "dataops.log"
+
+# Overridden by the logging section of config.yaml through configure_logging
+DEFAULT_SETTINGS = {
+    # text or json, for log files and the console respectively
+    "format": "text",
+    "console_format": "text",
+    # Rotate files past this size; 0 disables size rotation
+    "max_bytes": 10 * 2**20,
+    "backup_count": 5,
+    # Rotate on a schedule instead (TimedRotatingFileHandler's when, e.g. midnight)
+    "when": None,
+}
+
+_settings = dict(DEFAULT_SETTINGS)
+_lock = threading.Lock()
+_queue = None
+_listener = None
+_console = None
+# Resolved log file path -> handler, so each file is opened once per process
+_file_handlers = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, plus exc_info when set."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _formatter(kind: str) -> logging.Formatter:
+    return JsonFormatter() if kind == "json" else logging.Formatter(TEXT_FORMAT)
+
+
+def configure_logging(settings: dict = None):
+    """Apply format and rotation settings; files already open keep their rotation policy."""
+    with _lock:
+        _settings.update(DEFAULT_SETTINGS)
+        _settings.update(settings or {})
+        if _console is not None:
+            _console.setFormatter(_formatter(_settings["console_format"]))
+        for handler in _file_handlers.values():
+            handler.setFormatter(_formatter(_settings["format"]))
+
+
+def _file_handler(path: Path) -> logging.Handler:
+    if _settings["when"]:
+        handler = TimedRotatingFileHandler(path, when=_settings["when"], backupCount=_settings["backup_count"])
+    elif _settings["max_bytes"]:
+        handler = RotatingFileHandler(path, maxBytes=_settings["max_bytes"], backupCount=_settings["backup_count"])
+    else:
+        handler = logging.FileHandler(path)
+    handler.setFormatter(_formatter(_settings["format"]))
+    return handler
+
+
+def _start(logger: logging.Logger):
+    global _queue, _listener, _console
+    _queue = queue.SimpleQueue()
+    _console = logging.StreamHandler()
+    _console.setFormatter(_formatter(_settings["console_format"]))
+    # Callers only enqueue records; formatting and file I/O happen on the listener thread
+    _listener = QueueListener(_queue, _console)
+    _listener.start()
+    logger.addHandler(QueueHandler(_queue))
+    logger.propagate = False
+
+
+def shutdown_logging():
+    """Drain queued records and close every handler."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        logger = logging.getLogger("dataops")
+        for handler in [*logger.handlers, _console, *_file_handlers.values()]:
+            if handler is not None:
+                logger.removeHandler(handler)
+                handler.close()
+        _file_handlers.clear()
+
+
+def _before_fork():
+    # Holding every handler lock means the listener thread is not mid-write when the
+    # process forks, which would leave the child stuck on a stream's internal lock
+    _lock.acquire()
+    if _listener is not None:
+        for handler in _listener.handlers:
+            handler.acquire()
+
+
+def _after_fork_parent():
+    if _listener is not None:
+        for handler in _listener.handlers:
+            handler.release()
+    _lock.release()
+
+
+def _after_fork():
+    # logging has already reset the handler locks in the child. The listener thread
+    # does not survive fork, so a child writes to the handlers directly
+    global _lock, _listener, _queue
+    _lock = threading.Lock()
+    if _listener is None:
+        return
     logger = logging.getLogger("dataops")
-    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-    
-    handler = logging.StreamHandler()
-    handler.setFormatter(formatter)
-    if not logger.handlers:
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+    for handler in _listener.handlers:
         logger.addHandler(handler)
-    
-    if log_dir:
-        log_dir.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(log_dir)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
+    _listener = _queue = None
+
+
+atexit.register(shutdown_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_before_fork, after_in_parent=_after_fork_parent, after_in_child=_after_fork)
+
+
+def setup_logger(verbose: bool, log_file: Path = None):
+    """Return the dataops logger, adding log_file to its outputs if not already there.
+
+    Safe to call once per command or function: handlers are registered
+    once per process and per resolved file path. A directory gets
+    dataops.log inside it.
+    """
+    logger = logging.getLogger("dataops")
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    with _lock:
+        if _listener is None and not logger.handlers:
+            _start(logger)
+        if log_file:
+            path = Path(log_file)
+            if path.is_dir():
+                path = path / DEFAULT_LOG_FILE
+            path = path.resolve()
+            if path not in _file_handlers:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                handler = _file_handler(path)
+                _file_handlers[path] = handler
+                if _listener is not None:
+                    _listener.handlers = _listener.handlers + (handler,)
+                else:
+                    logger.addHandler(handler)
     return logger
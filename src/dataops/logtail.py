@@ -0,0 +1,243 @@
+import json
+import os
+import re
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BLOCK_SIZE = 64 * 1024
+# Bytes between entries of the sparse timestamp index
+INDEX_STRIDE = 1024 * 1024
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+# Leading timestamp of dataops (2024-01-01 12:00:00,123), Airflow ([2024-01-01T12:00:00.123+0000]) and ISO lines
+TIMESTAMP = re.compile(rb"^\[?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?)")
+LEVEL = re.compile(rb"\b(DEBUG|INFO|WARNING|ERROR|CRITICAL)\b")
+SINCE = re.compile(r"^(\d+)([smhd])$")
+UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+
+def _timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace(",", "."))
+    # Compare everything as naive local time, which is what the text formatter writes
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def parse_line(line: bytes) -> tuple:
+    """(timestamp, level) of a record's first line, or (None, None) for a continuation line."""
+    if line.startswith(b"{"):
+        try:
+            entry = json.loads(line)
+            return _timestamp(entry["time"]), entry.get("level")
+        except (ValueError, KeyError, TypeError):
+            return None, None
+    match = TIMESTAMP.match(line)
+    if not match:
+        return None, None
+    try:
+        timestamp = _timestamp(match.group(1).decode())
+    except ValueError:
+        return None, None
+    level = LEVEL.search(line, match.end(), match.end() + 120)
+    return timestamp, level.group(1).decode() if level else None
+
+
+def parse_since(value: str) -> datetime:
+    """A relative age like 30s, 15m, 2h or 1d, or an ISO date/time."""
+    match = SINCE.match(value.strip())
+    if match:
+        return datetime.now() - timedelta(**{UNITS[match.group(2)]: int(match.group(1))})
+    return _timestamp(value.strip())
+
+
+def _reverse_lines(f, end: int):
+    """Lines before offset end, last first, reading fixed-size blocks backwards."""
+    position, tail = end, b""
+    while position > 0:
+        size = min(BLOCK_SIZE, position)
+        position -= size
+        f.seek(position)
+        block = f.read(size) + tail
+        lines = block.split(b"\n")
+        tail = lines.pop(0)
+        for line in reversed(lines):
+            yield line
+    yield tail
+
+
+def _reverse_records(f, end: int):
+    """Records (timestamp, level, lines) last first; continuation lines stay with the line that starts them."""
+    pending = []
+    for i, line in enumerate(_reverse_lines(f, end)):
+        # A trailing newline leaves an empty last line
+        if i == 0 and not line:
+            continue
+        pending.append(line)
+        timestamp, level = parse_line(line)
+        if timestamp is not None:
+            yield timestamp, level, pending[::-1]
+            pending = []
+    if pending:
+        yield None, None, pending[::-1]
+
+
+def _matches(timestamp, level, min_level: int, since: datetime) -> bool:
+    if min_level and LEVELS.get(level, 0) < min_level:
+        return False
+    if since is not None and (timestamp is None or timestamp < since):
+        return False
+    return True
+
+
+def _sample(f, offset: int, limit: int) -> tuple:
+    # First timestamped line starting after offset, within limit bytes
+    f.seek(offset)
+    if offset:
+        f.readline()
+    while f.tell() < offset + limit:
+        start = f.tell()
+        line = f.readline()
+        if not line:
+            break
+        timestamp, _ = parse_line(line)
+        if timestamp is not None:
+            return start, timestamp
+    return None
+
+
+def _index_path(log_file: Path) -> Path:
+    return log_file.with_name(f".{log_file.name}.idx")
+
+
+def load_index(log_file: Path, f, stride: int = INDEX_STRIDE) -> list:
+    """Sparse [(offset, timestamp)] samples, one per stride bytes, kept next to the log.
+
+    Building it seeks to each stride boundary rather than reading the file, and a
+    saved index is extended as the log grows and rebuilt when the log is rotated.
+    """
+    stat = os.fstat(f.fileno())
+    index_path = _index_path(log_file)
+    entries, indexed = [], 0
+    try:
+        saved = json.loads(index_path.read_text())
+        if saved["inode"] == stat.st_ino and saved["stride"] == stride and saved["size"] <= stat.st_size:
+            entries = [(offset, datetime.fromisoformat(timestamp)) for offset, timestamp in saved["entries"]]
+            indexed = saved["size"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    if indexed == stat.st_size and entries:
+        return entries
+    boundary = (entries[-1][0] // stride + 1) * stride if entries else 0
+    while boundary < stat.st_size:
+        sample = _sample(f, boundary, stride)
+        if sample and (not entries or sample[0] > entries[-1][0]):
+            entries.append(sample)
+        boundary += stride
+    try:
+        index_path.write_text(json.dumps({
+            "inode": stat.st_ino,
+            "stride": stride,
+            "size": stat.st_size,
+            "entries": [(offset, timestamp.isoformat()) for offset, timestamp in entries],
+        }))
+    except OSError:
+        # A log we can read but not write next to (e.g. a root-owned scheduler.log) still works unindexed
+        pass
+    return entries
+
+
+def _records_since(f, start: int, end: int):
+    f.seek(start)
+    record = None
+    while f.tell() < end:
+        line = f.readline()
+        if not line:
+            break
+        line = line.rstrip(b"\n")
+        timestamp, level = parse_line(line)
+        if timestamp is None and record is not None:
+            record[2].append(line)
+            continue
+        if record is not None:
+            yield record
+        record = (timestamp, level, [line])
+    if record is not None:
+        yield record
+
+
+def read_log(log_file: Path, lines: int = None, level: str = None, since: datetime = None) -> tuple:
+    """Matching lines from the end of log_file, and the offset reading stopped at.
+
+    Without filters this is the last `lines` lines. --level keeps records at or
+    above that level and --since records at or after that time; with --since all
+    matching records are returned unless `lines` limits them to the last ones.
+    """
+    min_level = LEVELS[level.upper()] if level else 0
+    if lines is None:
+        lines = None if since is not None else 10
+    with open(log_file, "rb") as f:
+        end = os.fstat(f.fileno()).st_size
+        if since is not None:
+            # Start from the last index sample before since, not the top of the file
+            entries = load_index(log_file, f)
+            position = bisect_left([timestamp for _, timestamp in entries], since)
+            start = entries[position - 1][0] if position > 0 else 0
+            output = [
+                line for timestamp, record_level, record in _records_since(f, start, end)
+                if _matches(timestamp, record_level, min_level, since) for line in record
+            ]
+            return (output[-lines:] if lines else output), end
+        if not min_level:
+            output = []
+            for line in _reverse_lines(f, end):
+                if len(output) == lines:
+                    break
+                if line or output:
+                    output.append(line)
+            return output[::-1], end
+        output = []
+        for timestamp, record_level, record in _reverse_records(f, end):
+            if _matches(timestamp, record_level, min_level, None):
+                output[:0] = record
+                if len(output) >= lines:
+                    break
+        return output[-lines:], end
+
+
+def follow_log(log_file: Path, offset: int, level: str = None, since: datetime = None, interval: float = 1.0, emit=print):
+    """Print lines appended after offset until interrupted, reopening the log when it is rotated or truncated."""
+    min_level = LEVELS[level.upper()] if level else 0
+    f = open(log_file, "rb")
+    f.seek(offset)
+    inode = os.fstat(f.fileno()).st_ino
+    buffer, show = b"", True
+    try:
+        while True:
+            chunk = f.read(BLOCK_SIZE)
+            if chunk:
+                buffer += chunk
+                *complete, buffer = buffer.split(b"\n")
+                for line in complete:
+                    timestamp, record_level = parse_line(line)
+                    if timestamp is not None:
+                        show = _matches(timestamp, record_level, min_level, since)
+                    if show:
+                        emit(line.decode("utf-8", errors="replace"))
+                continue
+            try:
+                stat = os.stat(log_file)
+            except FileNotFoundError:
+                # Between the rename and the new file being created
+                time.sleep(interval)
+                continue
+            if stat.st_ino != inode or stat.st_size < f.tell():
+                # Rotated or truncated: everything in the old file has been read, start the new one
+                f.close()
+                f = open(log_file, "rb")
+                inode = os.fstat(f.fileno()).st_ino
+                buffer = b""
+                continue
+            time.sleep(interval)
+    finally:
+        f.close()
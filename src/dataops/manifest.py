@@ -0,0 +1,105 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+import yaml
+from dataops.logging import setup_logger
+from dataops.quality import evaluate_quality, save_runs
+
+# check-quality options a manifest target may set
+TARGET_OPTIONS = [
+    "table_name", "csv_path", "checks_config", "chunk_size", "pushdown", "workers", "incremental",
+    "watermark_column", "full_refresh", "sample", "reader", "profile",
+]
+
+
+def load_manifest(manifest_path: str) -> dict:
+    """Read and validate a check-many manifest; relative paths resolve against its directory."""
+    with open(manifest_path, "r") as f:
+        manifest = yaml.safe_load(f) or {}
+    base = Path(manifest_path).resolve().parent
+    targets, errors = [], []
+    for i, target in enumerate(manifest.get("targets") or []):
+        if not isinstance(target, dict):
+            errors.append(f"targets[{i}]: must be a mapping")
+            continue
+        name = target.get("name") or target.get("table_name") or target.get("csv_path") or f"target-{i}"
+        unknown = set(target) - {"name", "source", "priority", *TARGET_OPTIONS}
+        if unknown:
+            errors.append(f"target {name}: unknown keys {', '.join(sorted(unknown))}")
+        source = target.get("source", "db")
+        if source not in ["db", "csv"]:
+            errors.append(f"target {name}: source must be db or csv")
+        if source == "csv" and not target.get("csv_path"):
+            errors.append(f"target {name}: csv_path required for csv source")
+        target = {**target, "name": name, "source": source, "priority": target.get("priority", 0)}
+        for key in ["csv_path", "checks_config"]:
+            if target.get(key):
+                target[key] = str(base / target[key])
+        targets.append(target)
+    if not targets and not errors:
+        errors.append("targets must be a non-empty list")
+    names = [target["name"] for target in targets]
+    errors += [f"target {name}: name used more than once" for name in sorted(set(names)) if names.count(name) > 1]
+    if errors:
+        raise ValueError(f"Invalid manifest {manifest_path}:\n" + "\n".join(f"  - {error}" for error in errors))
+    # Highest priority first; the pool starts targets in this order
+    targets.sort(key=lambda target: -target["priority"])
+    return {"max_workers": manifest.get("max_workers"), "targets": targets}
+
+
+def run_target(target: dict, config: dict, logger) -> dict:
+    return evaluate_quality(
+        target["source"], target.get("csv_path"), config, logger,
+        table_name=target.get("table_name", "data_table"),
+        checks_config_path=target.get("checks_config"),
+        chunk_size=target.get("chunk_size"),
+        pushdown=target.get("pushdown", False),
+        workers=target.get("workers", 1),
+        incremental=target.get("incremental", False),
+        watermark_column=target.get("watermark_column"),
+        full_refresh=target.get("full_refresh", False),
+        sample=target.get("sample"),
+        reader=target.get("reader"),
+        profile=target.get("profile", False),
+    )
+
+
+def run_manifest(manifest_path: str, config: dict, verbose: bool = False, max_workers: int = None) -> list:
+    """Check every manifest target on a bounded thread pool and save all runs in one transaction.
+
+    Threads share the process's pooled engines. Returns one summary dict per
+    target (name, status, rows, seconds, rows_per_sec, error), in priority order.
+    """
+    logger = setup_logger(verbose, Path(config["log_dir"]) / "data_quality.log")
+    manifest = load_manifest(manifest_path)
+    targets = manifest["targets"]
+    max_workers = max_workers or manifest["max_workers"] or min(len(targets), os.cpu_count() or 1)
+    logger.info(f"Checking {len(targets)} targets with {max_workers} workers")
+
+    summary = {target["name"]: {"name": target["name"], "status": "failed", "rows": 0} for target in targets}
+    runs = []
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="check-many") as executor:
+        futures = {executor.submit(run_target, target, config, logger): target["name"] for target in targets}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                run = future.result()
+            except Exception as e:
+                logger.error(f"Target {name} failed: {e}")
+                summary[name]["error"] = str(e)
+                continue
+            runs.append(run)
+            rows = run["rows"] or 0
+            summary[name].update(
+                status="ok", rows=rows, seconds=run["duration"], rows_per_sec=rows / max(run["duration"], 1e-9)
+            )
+            logger.info(f"Target {name}: {rows} rows in {run['duration']:.2f}s")
+
+    if runs:
+        save_runs(config, runs, logger)
+    elapsed = time.perf_counter() - started
+    total_rows = sum(entry["rows"] for entry in summary.values())
+    logger.info(f"Checked {len(runs)}/{len(targets)} targets, {total_rows} rows in {elapsed:.2f}s")
+    return list(summary.values())
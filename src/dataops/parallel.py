@@ -0,0 +1,239 @@
+import math
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from sqlalchemy import inspect, text
+from dataops.accumulators import (
+    SPILL_PARTITIONS, FieldAccumulator, accumulate_frames, is_exact_unique, read_spill_partition
+)
+from dataops.engines import get_engine
+from dataops.profiling import Profiler
+from dataops.sources import csv_dtypes, csv_header, field_dtypes, iter_csv_range, iter_frames
+
+
+def _key_ranges(low, high, partitions: int) -> list:
+    step = math.ceil((high - low + 1) / partitions)
+    return [(lo, min(lo + step - 1, high)) for lo in range(low, high + 1, step)]
+
+
+def plan_partitions(source: str, engine, csv_path: str, table_name: str, workers: int, logger) -> list:
+    """Split the source into roughly equal partitions.
+
+    CSV files are split into byte ranges aligned to line boundaries, SQLite
+    tables into rowid ranges and other databases into ranges over an integer
+    primary key. Returns a list of partition specs for partition_task().
+    """
+    if source == "csv":
+        _, data_start = csv_header(csv_path)
+        size = os.path.getsize(csv_path)
+        step = max(math.ceil((size - data_start) / workers), 1)
+        return [{"start": start, "end": min(start + step, size)} for start in range(data_start, size, step)]
+
+    if engine.dialect.name == "sqlite":
+        key = "rowid"
+    else:
+        pk = inspect(engine).get_pk_constraint(table_name).get("constrained_columns", [])
+        columns = {column["name"]: column for column in inspect(engine).get_columns(table_name)}
+        if len(pk) != 1 or columns[pk[0]]["type"].python_type is not int:
+            logger.warning(f"Table {table_name} has no integer primary key, running as a single partition")
+            return [{"where": None, "params": None}]
+        key = engine.dialect.identifier_preparer.quote(pk[0])
+    with engine.connect() as conn:
+        low, high = conn.execute(text(f"SELECT MIN({key}), MAX({key}) FROM {table_name}")).one()
+    if low is None:
+        return [{"where": None, "params": None}]
+    return [
+        {"where": f"{key} >= :lo AND {key} <= :hi", "params": {"lo": lo, "hi": hi}}
+        for lo, hi in _key_ranges(low, high, workers)
+    ]
+
+
+def partition_task(
+    index: int,
+    spec: dict,
+    source: str,
+    csv_path: str,
+    config: dict,
+    table_name: str,
+    fields: list,
+    logger,
+    chunk_size: int = None,
+    unique_memory_budget: int = None,
+    spill_dir: str = None,
+    profile: bool = False
+) -> dict:
+    return {
+        "index": index,
+        "spec": spec,
+        "source": source,
+        "csv_path": csv_path,
+        "config": config,
+        "table_name": table_name,
+        "columns": [field.name for field in fields],
+        # Same typing as an unpartitioned read; fields are already limited to the source's columns
+        "dtype": csv_dtypes(fields) if source == "csv" else field_dtypes(fields),
+        "fields": fields,
+        "chunk_size": chunk_size,
+        "unique_memory_budget": unique_memory_budget,
+        "spill_dir": spill_dir,
+        "logger": logger,
+        "profiler": Profiler(profile),
+    }
+
+
+def check_partition(task: dict):
+    """Check one partition from partition_task(); returns (index, accumulators, seconds).
+
+    Exact unique keys are flushed to the spill directory, so the accumulators
+    are small to pickle and merge_partitions() reduces the keys from disk.
+    """
+    started = time.perf_counter()
+    spec = task["spec"]
+    if task["source"] == "csv":
+        frames = iter_csv_range(task["csv_path"], spec["start"], spec["end"], task["chunk_size"], task["columns"], task["dtype"])
+    else:
+        frames = iter_frames(
+            "db", get_engine(task["config"], read_only=True), table_name=task["table_name"],
+            chunk_size=task["chunk_size"], columns=task["columns"], where=spec["where"], params=spec["params"],
+            dtype=task["dtype"]
+        )
+    accumulators = accumulate_frames(
+        frames, task["fields"], task["logger"], task["unique_memory_budget"], task["spill_dir"], task["profiler"]
+    )
+    for accumulator in accumulators.values():
+        if is_exact_unique(accumulator.checks):
+            # Shuffle: every key goes to its hash bucket on disk for the reduce step
+            accumulator.unique.flush()
+    return task["index"], accumulators, time.perf_counter() - started
+
+
+def _count_distinct(task: tuple) -> int:
+    spill_paths, bucket = task
+    keys = set()
+    for spill_path in spill_paths:
+        for batch in read_spill_partition(spill_path, bucket):
+            keys.update(batch)
+    return len(keys)
+
+
+def present_fields(source: str, engine, csv_path: str, table_name: str, fields: list, logger) -> list:
+    """The fields whose columns exist in the source, warning about the rest."""
+    if source == "csv":
+        if not csv_path or not Path(csv_path).exists():
+            raise ValueError("Valid CSV path required")
+        columns = csv_header(csv_path)[0]
+    else:
+        columns = [column["name"] for column in inspect(engine).get_columns(table_name)]
+    present = []
+    for field in fields:
+        if field.name not in columns:
+            logger.warning(f"Field {field.name} not found in data")
+        else:
+            present.append(field)
+    return present
+
+
+def merge_partitions(fields: list, outcomes: list, profiler=None, map_fn=map) -> dict:
+    """Merge the accumulators of every partition into one result per field.
+
+    Non-unique metrics are plain sums. Exact unique totals are reduced from
+    the shuffled spill buckets, with map_fn spreading the buckets over a pool.
+    """
+    unique_fields = [field.name for field in fields if is_exact_unique(field.checks)]
+    merged = {}
+    for field in fields:
+        checks = dict(field.checks)
+        if field.name in unique_fields:
+            checks["unique"] = False
+        merged[field.name] = FieldAccumulator(field.with_checks(checks))
+    totals = {name: 0 for name in unique_fields}
+    spill_paths = {name: [] for name in unique_fields}
+    for accumulators in outcomes:
+        for name, accumulator in accumulators.items():
+            merged[name].merge(accumulator)
+            if accumulator.timings is not None and profiler is not None:
+                # Summed over workers, so these are CPU seconds rather than wall time
+                timings = profiler.check_timings(name)
+                for check, seconds in accumulator.timings.items():
+                    timings[check] = timings.get(check, 0.0) + seconds
+            if name in unique_fields:
+                totals[name] += accumulator.unique.total
+                if accumulator.unique.spill_path:
+                    spill_paths[name].append(accumulator.unique.spill_path)
+
+    results = {name: accumulator.result() for name, accumulator in merged.items()}
+    for name in unique_fields:
+        buckets = [(spill_paths[name], bucket) for bucket in range(SPILL_PARTITIONS)]
+        distinct = sum(map_fn(_count_distinct, buckets))
+        results[name]["duplicates"] = totals[name] - distinct
+    return results
+
+
+def run_partitioned(
+    source: str,
+    engine,
+    csv_path: str,
+    table_name: str,
+    fields: list,
+    config: dict,
+    workers: int,
+    logger,
+    chunk_size: int = None,
+    unique_memory_budget: int = None,
+    spill_dir: str = None,
+    profiler=None
+) -> dict:
+    """Check the source with one process per partition and merge the results.
+
+    Returns the merged results and the number of rows checked.
+    Non-unique metrics are plain sums. Unique checks are exact: each worker
+    spills its keys to hash buckets and the buckets are reduced in parallel.
+    """
+    present = present_fields(source, engine, csv_path, table_name, fields, logger)
+    if not present:
+        return {}, 0
+
+    partitions = plan_partitions(source, engine, csv_path, table_name, workers, logger)
+    logger.info(f"Checking {len(partitions)} partitions with {workers} workers")
+    # Partitions that finish after another one fails are never collected, so every
+    # key this run spills goes under one directory that is removed at the end
+    run_spill_dir = tempfile.mkdtemp(prefix="partitioned-", dir=spill_dir)
+    tasks = [
+        partition_task(
+            i, spec, source, csv_path, config, table_name, present, logger, chunk_size,
+            unique_memory_budget, run_spill_dir, profiler is not None and profiler.enabled
+        )
+        for i, spec in enumerate(partitions)
+    ]
+
+    outcomes = []
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            try:
+                for index, accumulators, elapsed in executor.map(check_partition, tasks):
+                    outcomes.append(accumulators)
+                    rows = partition_rows(accumulators)
+                    logger.info(
+                        f"Partition {index}: {rows} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):.0f} rows/s)"
+                    )
+                results = merge_partitions(present, outcomes, profiler, executor.map)
+            finally:
+                for accumulators in outcomes:
+                    for accumulator in accumulators.values():
+                        accumulator.close()
+    finally:
+        # After the pool has shut down, so no worker is still writing into it
+        shutil.rmtree(run_spill_dir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - started
+    rows = sum(partition_rows(accumulators) for accumulators in outcomes)
+    logger.info(f"Checked {rows} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):.0f} rows/s)")
+    return results, rows
+
+
+def partition_rows(accumulators: dict) -> int:
+    return max((accumulator.rows for accumulator in accumulators.values()), default=0)
@@ -0,0 +1,131 @@
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from dataops.sources import peak_memory_mb
+
+_NO_PHASE = nullcontext()
+
+
+class Profiler:
+    """Per-phase and per-check timings for one quality run.
+
+    A disabled profiler hands out shared no-op context managers and leaves
+    the frame iterators untouched, so an unprofiled run pays nothing. Phase
+    times are exclusive: a phase recorded inside another (such as load
+    inside checks) is not counted again in the outer one, so phases add up
+    to at most the run's total.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        # (phase, seconds, rows, peak memory MB) in completion order
+        self.phases = []
+        # field -> check -> seconds
+        self.checks = {}
+        self.rows = None
+        # Seconds recorded by nested phases, one entry per open phase
+        self._nested = []
+
+    def phase(self, name: str, rows: int = None):
+        if not self.enabled:
+            return _NO_PHASE
+        return self._phase(name, rows)
+
+    @contextmanager
+    def _phase(self, name: str, rows: int = None):
+        self._nested.append(0.0)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            nested = self._nested.pop()
+            self.record(name, time.perf_counter() - started - nested, rows)
+            if self._nested:
+                # The enclosing phase subtracts all of this one, nested phases included
+                self._nested[-1] += nested
+
+    def record(self, name: str, seconds: float, rows: int = None):
+        self.phases.append((name, seconds, rows, peak_memory_mb()))
+        if self._nested:
+            self._nested[-1] += seconds
+
+    def frames(self, frames, name: str = "load"):
+        """Wrap a frame iterator, recording the time spent producing frames as its own phase."""
+        if not self.enabled:
+            return frames
+        return self._timed_frames(frames, name)
+
+    def _timed_frames(self, frames, name: str):
+        seconds, rows = 0.0, 0
+        iterator = iter(frames)
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    df = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    seconds += time.perf_counter() - started
+                rows += len(df)
+                yield df
+        finally:
+            self.record(name, seconds, rows)
+
+    def check_timings(self, field_name: str) -> dict:
+        if not self.enabled:
+            return None
+        return self.checks.setdefault(field_name, {})
+
+    def summary(self) -> list:
+        """Rows of (phase, field, check, seconds, rows, peak memory MB)."""
+        rows = [(name, None, None, seconds, count, peak) for name, seconds, count, peak in self.phases]
+        for field_name, timings in self.checks.items():
+            for check, seconds in timings.items():
+                rows.append(("check", field_name, check, seconds, None, None))
+        return rows
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def write_textfile(profiler: Profiler, path: Path, table_name: str):
+    """Export the profile in the OpenMetrics text format for node_exporter's textfile collector.
+
+    The file is replaced atomically so the collector never reads half of it.
+    """
+    table = f'table="{_label(table_name)}"'
+    lines = [
+        "# HELP dataops_quality_phase_seconds Time spent in each phase of the last quality run.",
+        "# TYPE dataops_quality_phase_seconds gauge",
+    ]
+    for name, seconds, _, _ in profiler.phases:
+        lines.append(f'dataops_quality_phase_seconds{{{table},phase="{_label(name)}"}} {seconds:.6f}')
+    lines += [
+        "# HELP dataops_quality_check_seconds Time spent in each check of the last quality run.",
+        "# TYPE dataops_quality_check_seconds gauge",
+    ]
+    for field_name, timings in profiler.checks.items():
+        for check, seconds in timings.items():
+            lines.append(
+                f'dataops_quality_check_seconds{{{table},field="{_label(field_name)}",check="{_label(check)}"}} {seconds:.6f}'
+            )
+    peak = max((phase[3] for phase in profiler.phases), default=peak_memory_mb())
+    lines += [
+        "# HELP dataops_quality_rows Rows processed by the last quality run.",
+        "# TYPE dataops_quality_rows gauge",
+        f"dataops_quality_rows{{{table}}} {profiler.rows or 0}",
+        "# HELP dataops_quality_peak_memory_bytes Peak resident memory of the last quality run.",
+        "# TYPE dataops_quality_peak_memory_bytes gauge",
+        f"dataops_quality_peak_memory_bytes{{{table}}} {int(peak * 2**20)}",
+        "# HELP dataops_quality_last_run_timestamp_seconds When the last quality run finished.",
+        "# TYPE dataops_quality_last_run_timestamp_seconds gauge",
+        f"dataops_quality_last_run_timestamp_seconds{{{table}}} {time.time():.3f}",
+        "# EOF",
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
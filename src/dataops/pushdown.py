@@ -0,0 +1,95 @@
+from sqlalchemy import inspect, text
+from dataops.accumulators import CHECK_METRICS, PYTHON_ONLY_REGEX
+from dataops.engines import register_sqlite_regexp
+
+def _regex_condition(column: str, param: str, dialect: str, pattern: str):
+    if dialect == "sqlite":
+        return f"{column} REGEXP :{param}", pattern
+    if dialect == "postgresql" and not PYTHON_ONLY_REGEX.search(pattern):
+        # ~ searches anywhere, str.match anchors at the start
+        return f"{column} ~ :{param}", f"^(?:{pattern})"
+    return None, None
+
+
+def compile_checks(fields: list, table_name: str, dialect: str, quote=lambda name: name):
+    """Compile the checks config into one aggregate query over table_name.
+
+    Returns (sql, params, pushed, fallback): pushed is a list of
+    (field, metric, alias) read from the result row, fallback holds copies of
+    the field configs with only the checks that must run in pandas.
+    """
+    selects, params, pushed, fallback = [], {}, [], []
+    for i, field in enumerate(fields):
+        column = quote(field.name)
+        checks = field.checks
+        remaining = {}
+        for check, metric in CHECK_METRICS.items():
+            if check not in checks or (check != "regex" and not checks[check]):
+                continue
+            alias = f"f{i}_{metric}"
+            if check == "approx_unique":
+                # Sketches only pay off in pandas; COUNT(DISTINCT) covers unique: {approx: true}
+                remaining[check] = checks[check]
+                continue
+            if check == "not_null":
+                expr = f"SUM(CASE WHEN {column} IS NULL THEN 1 ELSE 0 END)"
+            elif check == "regex":
+                condition, pattern = None, None
+                if field.type == "string":
+                    condition, pattern = _regex_condition(column, alias, dialect, checks["regex"])
+                if condition is None:
+                    remaining[check] = checks[check]
+                    continue
+                params[alias] = pattern
+                expr = f"SUM(CASE WHEN {column} IS NULL OR NOT ({condition}) THEN 1 ELSE 0 END)"
+            elif check == "range":
+                if field.type not in ["integer", "float"]:
+                    continue
+                min_val, max_val = checks["range"]
+                params[f"{alias}_min"], params[f"{alias}_max"] = min_val, max_val
+                expr = f"SUM(CASE WHEN {column} < :{alias}_min OR {column} > :{alias}_max THEN 1 ELSE 0 END)"
+            elif check == "positive":
+                expr = f"SUM(CASE WHEN {column} <= 0 THEN 1 ELSE 0 END)"
+            else:
+                # pandas duplicated() treats all nulls as one value, COUNT(DISTINCT) skips them
+                expr = (
+                    f"COUNT(*) - COUNT(DISTINCT {column}) "
+                    f"- MAX(CASE WHEN {column} IS NULL THEN 1 ELSE 0 END)"
+                )
+            selects.append(f"COALESCE({expr}, 0) AS {alias}")
+            pushed.append((field.name, metric, alias))
+        if remaining:
+            fallback.append(field.with_checks(remaining))
+    sql = f"SELECT {', '.join(['COUNT(*) AS row_count'] + selects)} FROM {table_name}"
+    return sql, params, pushed, fallback
+
+
+def run_pushdown(engine, fields: list, table_name: str, logger):
+    """Run the pushable checks as a single aggregate query.
+
+    Returns the pushed results, the fields that still need the pandas path and
+    the table's row count.
+    """
+    columns = {column["name"] for column in inspect(engine).get_columns(table_name)}
+    present = []
+    for field in fields:
+        if field.name not in columns:
+            logger.warning(f"Field {field.name} not found in data")
+        else:
+            present.append(field)
+
+    dialect = engine.dialect.name
+    sql, params, pushed, fallback = compile_checks(
+        present, table_name, dialect, engine.dialect.identifier_preparer.quote
+    )
+    results = {field.name: {} for field in present}
+    logger.debug(f"Pushdown query: {sql}")
+    with engine.connect() as conn:
+        if dialect == "sqlite":
+            register_sqlite_regexp(conn.connection.driver_connection)
+        row = conn.execute(text(sql), params).mappings().one()
+    for field_name, metric, alias in pushed:
+        results[field_name][metric] = int(row[alias])
+    for field in fallback:
+        logger.info(f"Field {field.name} - falling back to pandas for {', '.join(field.checks)}")
+    return results, fallback, int(row["row_count"])
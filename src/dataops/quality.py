@@ -1,10 +1,19 @@
-import pandas as pd
-from sqlalchemy import create_engine, text
 from datetime import datetime
+import time
+import uuid6
 from pathlib import Path
-import yaml
-import re
+from dataops.checks import load_plan
+from dataops.engines import get_engine
 from dataops.logging import setup_logger
+from dataops.accumulators import METRICS, accumulate_frames
+from dataops.arrow_source import is_parquet, iter_arrow_tables
+from dataops.pushdown import run_pushdown
+from dataops.parallel import run_partitioned
+from dataops.incremental import run_incremental
+from dataops.profiling import Profiler, write_textfile
+from dataops.results import ensure_schema, write_profile, write_run
+from dataops.sampling import add_rate_estimates, sample_frame
+from dataops.sources import csv_dtypes, db_projection, iter_frames, peak_memory_mb, plan_db_chunk_size
 
 def run_quality_checks(
     source: str,
@@ -12,92 +21,199 @@ def run_quality_checks(
     config: dict = None,
     verbose: bool = False,
     table_name: str = "data_table",
-    checks_config_path: str = None
+    checks_config_path: str = None,
+    chunk_size: int = None,
+    pushdown: bool = False,
+    workers: int = 1,
+    incremental: bool = False,
+    watermark_column: str = None,
+    full_refresh: bool = False,
+    sample: int = None,
+    reader: str = None,
+    profile: bool = False
 ):
     logger = setup_logger(verbose, Path(config["log_dir"]) / "data_quality.log")
+    run = evaluate_quality(
+        source, csv_path, config, logger, table_name, checks_config_path, chunk_size, pushdown, workers,
+        incremental, watermark_column, full_refresh, sample, reader, profile
+    )
+    save_runs(config, [run], logger)
+    return run["results"]
+
+def evaluate_quality(
+    source: str,
+    csv_path: str,
+    config: dict,
+    logger,
+    table_name: str = "data_table",
+    checks_config_path: str = None,
+    chunk_size: int = None,
+    pushdown: bool = False,
+    workers: int = 1,
+    incremental: bool = False,
+    watermark_column: str = None,
+    full_refresh: bool = False,
+    sample: int = None,
+    reader: str = None,
+    profile: bool = False
+) -> dict:
+    """Run the checks for one source without saving them; save_runs() stores the returned run."""
+    started = time.perf_counter()
+    profiler = Profiler(profile)
     
-    # Load checks configuration
-    if checks_config_path:
-        with open(checks_config_path, "r") as f:
-            checks_config = yaml.safe_load(f)
-    else:
-        checks_config = {
-            "fields": [
-                {"name": "id", "type": "string", "checks": {"not_null": True}},
-                {"name": "name", "type": "string", "checks": {"not_null": True}},
-                {"name": "email", "type": "string", "checks": {"regex": r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"}},
-                {"name": "age", "type": "integer", "checks": {"range": [18, 80]}},
-                {"name": "salary", "type": "integer", "checks": {"range": [30000, 120000]}}
-            ]
-        }
+    # Compiled once per checks file and cached
+    with profiler.phase("config"):
+        plan = load_plan(checks_config_path)
+    
+    # Shared pooled engines: checks read from the replica when one is configured
+    with profiler.phase("connect"):
+        read_engine = get_engine(config, read_only=True)
+        if profiler.enabled:
+            # Check a connection out now so its cost lands here rather than in the load
+            read_engine.connect().close()
     
-    # Initialize engine
-    db_type = config["database"]["type"]
-    if db_type == "sqlite":
-        engine = create_engine(f"sqlite:///{config['database']['path']}")
-    else:
-        engine = create_engine(
-            f"postgresql://{config['database']['user']}:{config['database']['password']}@{config['database']['host']}:{config['database']['port']}/{config['database']['name']}"
-        )
+    quality_config = config.get("quality", {})
+    unique_memory_budget = int(quality_config.get("unique_memory_mb", 256) * 1024 * 1024)
+    spill_dir = Path(config["data_dir"]) / "spill"
+    spill_dir.mkdir(parents=True, exist_ok=True)
     
-    # Load data
-    if source == "csv":
-        if not csv_path or not Path(csv_path).exists():
-            raise ValueError("Valid CSV path required")
-        df = pd.read_csv(csv_path)
-    else:
-        with engine.connect() as conn:
-            df = pd.read_sql(f"SELECT * FROM {table_name}", conn)
+    # Parquet is only readable through Arrow, CSV can opt in
+    parquet = source == "csv" and bool(csv_path) and is_parquet(csv_path)
+    arrow = parquet or (source == "csv" and (reader or quality_config.get("csv_reader", "pandas")) == "arrow")
+    if arrow and (sample or incremental or workers > 1):
+        if parquet:
+            raise ValueError("Parquet sources do not support sampled, incremental or multi-worker runs")
+        logger.warning("Sampled, incremental and multi-worker runs read CSV with pandas")
     
-    # Perform quality checks
+    # Push what we can down to the database, the rest runs in pandas
+    fields = list(plan.fields)
+    columns = None
     results = {}
-    for field in checks_config.get("fields", []):
-        field_name = field["name"]
-        if field_name not in df.columns:
-            logger.warning(f"Field {field_name} not found in data")
-            continue
-        
-        field_results = {}
-        checks = field.get("checks", {})
-        
-        if "not_null" in checks and checks["not_null"]:
-            field_results["nulls"] = int(df[field_name].isnull().sum())
-        
-        if "regex" in checks:
-            regex = checks["regex"]
-            field_results["invalid_format"] = len(df[~df[field_name].str.match(regex, na=False)])
-        
-        if "range" in checks and field["type"] in ["integer", "float"]:
-            min_val, max_val = checks["range"]
-            field_results["out_of_range"] = len(df[(df[field_name] < min_val) | (df[field_name] > max_val)])
-        
-        if "positive" in checks and checks["positive"]:
-            field_results["non_positive"] = len(df[df[field_name] <= 0])
-        
-        if "unique" in checks and checks["unique"]:
-            field_results["duplicates"] = len(df[df[field_name].duplicated()])
-        
-        results[field_name] = field_results
+    rows = None
+    if sample and (pushdown or incremental or workers > 1):
+        logger.warning("Sampled runs ignore pushdown, incremental and workers")
+    elif incremental and (pushdown or workers > 1):
+        logger.warning("Incremental runs ignore pushdown and workers")
+    if pushdown and source == "db" and not (incremental or sample):
+        with profiler.phase("pushdown"):
+            results, fields, rows = run_pushdown(read_engine, fields, table_name, logger)
+        columns = [field.name for field in fields]
+    frame_results = {}
+    with profiler.phase("checks"):
+        if sample:
+            with profiler.phase("load"):
+                df = sample_frame(source, read_engine, csv_path, table_name, sample, chunk_size, fields=fields)
+            logger.info(f"Sampled {len(df)} rows")
+            frame_results, rows = check_frames([df], fields, logger, unique_memory_budget, str(spill_dir), profiler)
+        elif incremental:
+            frame_results, rows = run_incremental(
+                source, read_engine, csv_path, table_name, fields, config, logger, chunk_size,
+                unique_memory_budget, watermark_column or plan.watermark_column, full_refresh, profiler
+            )
+        elif fields and workers > 1:
+            frame_results, rows = run_partitioned(
+                source, read_engine, csv_path, table_name, fields, config, workers, logger,
+                chunk_size, unique_memory_budget, str(spill_dir), profiler
+            )
+        elif fields and arrow:
+            frames = profiler.frames(iter_arrow_tables(csv_path, fields, chunk_size))
+            frame_results, rows = check_frames(frames, fields, logger, unique_memory_budget, str(spill_dir), profiler)
+        elif fields:
+            dtype = csv_dtypes(fields)
+            if source == "db":
+                # Typed read of only the checked columns, chunked if it would not fit the budget
+                columns, dtype = db_projection(read_engine, table_name, fields)
+                if not chunk_size:
+                    load_memory_budget = int(quality_config.get("load_memory_mb", 1024) * 1024 * 1024)
+                    chunk_size = plan_db_chunk_size(read_engine, table_name, columns, dtype, load_memory_budget)
+                    if chunk_size:
+                        logger.info(f"{table_name} exceeds quality.load_memory_mb, reading {chunk_size} rows at a time")
+            frames = profiler.frames(iter_frames(source, read_engine, csv_path, table_name, chunk_size, columns, dtype=dtype))
+            frame_results, rows = check_frames(frames, fields, logger, unique_memory_budget, str(spill_dir), profiler)
+    for field_name, field_results in frame_results.items():
+        merged = {**results.get(field_name, {}), **field_results}
+        results[field_name] = {
+            metric: merged[metric] for metric in METRICS if metric in merged
+        }
+    if sample:
+        add_rate_estimates(results, len(df))
+    logger.info(f"Loaded {rows or 0} rows, peak memory {peak_memory_mb():.0f} MB")
+    
+    for field_name, field_results in results.items():
         for check, value in field_results.items():
             logger.info(f"Field {field_name} - {check}: {value}")
     
-    # Save results to database
-    with engine.connect() as conn:
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS results (
-                date TIMESTAMP,
-                field TEXT,
-                metric TEXT,
-                value INTEGER
-            )
-        """))
-        current_time = datetime.now()
-        for field_name, field_results in results.items():
-            for metric, value in field_results.items():
-                conn.execute(
-                    text("INSERT INTO results (date, field, metric, value) VALUES (:date, :field, :metric, :value)"),
-                    {"date": current_time, "field": field_name, "metric": metric, "value": value}
+    return make_run(
+        csv_path if source == "csv" else table_name, results, plan.digest, rows,
+        time.perf_counter() - started, bool(sample), profiler
+    )
+
+def make_run(
+    source_name: str,
+    results: dict,
+    config_hash: str,
+    rows: int,
+    duration: float,
+    sampled: bool = False,
+    profiler=None
+) -> dict:
+    """A run record for save_runs(), stamped with a new run ID and the current time."""
+    return {
+        "run_id": str(uuid6.uuid7()),
+        "date": datetime.now(),
+        "source_name": source_name,
+        "results": results,
+        "config_hash": config_hash,
+        "rows": rows,
+        "duration": duration,
+        "sampled": sampled,
+        "profiler": profiler or Profiler(False),
+    }
+
+def save_runs(config: dict, runs: list, logger):
+    """Write runs from evaluate_quality() and their metrics in a single transaction."""
+    engine = get_engine(config)
+    with engine.begin() as conn:
+        ensure_schema(conn)
+        for run in runs:
+            profiler = run["profiler"]
+            with profiler.phase("write"):
+                write_run(
+                    conn, run["run_id"], run["results"], run["date"],
+                    table_name=run["source_name"],
+                    config_hash=run["config_hash"],
+                    row_count=run["rows"],
+                    duration=run["duration"],
+                    sampled=run["sampled"],
                 )
-        conn.commit()
+            if profiler.enabled:
+                profiler.rows = run["rows"]
+                profiler.record("total", run["duration"], run["rows"])
+                write_profile(conn, run["run_id"], profiler)
     
-    return results
+    textfile_dir = Path(config.get("quality", {}).get("textfile_dir", Path(config["data_dir"]) / "metrics"))
+    for run in runs:
+        logger.info(f"Saved results for run {run['run_id']}")
+        profiler = run["profiler"]
+        if not profiler.enabled:
+            continue
+        for phase, field_name, check, seconds, count, peak in profiler.summary():
+            name = f"{field_name}.{check}" if field_name else phase
+            logger.info(f"Profile {name}: {seconds:.3f}s" + (f", {count} rows, peak {peak:.0f} MB" if count is not None else ""))
+        file_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in Path(run["source_name"]).name)
+        write_textfile(profiler, textfile_dir / f"dataops_quality_{file_name}.prom", run["source_name"])
+
+def check_frames(
+    frames, fields: list, logger, unique_memory_budget: int = None, spill_dir: str = None, profiler=None
+):
+    """Run the checks over an iterable of DataFrames or Arrow tables and merge the per-chunk totals.
+
+    Returns the results and the number of rows checked.
+    """
+    accumulators = accumulate_frames(frames, fields, logger, unique_memory_budget, spill_dir, profiler)
+    try:
+        results = {field_name: accumulator.result() for field_name, accumulator in accumulators.items()}
+        return results, max((accumulator.rows for accumulator in accumulators.values()), default=0)
+    finally:
+        for accumulator in accumulators.values():
+            accumulator.close()
@@ -0,0 +1,187 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy import (
+    BigInteger, Boolean, Column, Date, DateTime, Float, Index, Integer, MetaData, String, Table, Text,
+    inspect, insert, text,
+)
+from dataops.engines import get_engine
+from dataops.logging import setup_logger
+
+metadata = MetaData()
+
+results_table = Table(
+    "results",
+    metadata,
+    Column("date", DateTime),
+    Column("field", Text),
+    Column("metric", Text),
+    Column("value", Float(53)),
+    Column("sampled", Boolean, default=False),
+    Column("run_id", String(36)),
+    Index("ix_results_date_field_metric", "date", "field", "metric"),
+    Index("ix_results_run_id", "run_id"),
+)
+
+runs_table = Table(
+    "runs",
+    metadata,
+    Column("run_id", String(36), primary_key=True),
+    Column("date", DateTime),
+    Column("table_name", Text),
+    Column("config_hash", String(16)),
+    Column("row_count", BigInteger),
+    Column("duration", Float(53)),
+    Column("sampled", Boolean, default=False),
+    Index("ix_runs_date", "date"),
+)
+
+profiles_table = Table(
+    "run_profiles",
+    metadata,
+    Column("run_id", String(36)),
+    Column("phase", String(64)),
+    Column("field", Text),
+    Column("check_name", String(64)),
+    Column("seconds", Float(53)),
+    Column("rows", BigInteger),
+    Column("peak_memory_mb", Float(53)),
+    Index("ix_run_profiles_run_id", "run_id"),
+)
+
+daily_table = Table(
+    "results_daily",
+    metadata,
+    Column("day", Date, primary_key=True),
+    Column("field", String(255), primary_key=True),
+    Column("metric", String(255), primary_key=True),
+    # Sampled runs store rates, so they are rolled up apart from full runs
+    Column("sampled", Boolean, primary_key=True, default=False),
+    Column("min_value", Float(53)),
+    Column("max_value", Float(53)),
+    Column("avg_value", Float(53)),
+    Column("samples", Integer),
+)
+
+
+def ensure_schema(conn):
+    """Create the results store, upgrading a results table from older versions in place."""
+    metadata.create_all(conn)
+    columns = {column["name"]: column for column in inspect(conn).get_columns("results")}
+    if "sampled" not in columns:
+        conn.execute(text("ALTER TABLE results ADD COLUMN sampled BOOLEAN DEFAULT FALSE"))
+    if "run_id" not in columns:
+        conn.execute(text("ALTER TABLE results ADD COLUMN run_id VARCHAR(36)"))
+    if conn.dialect.name == "postgresql" and isinstance(columns["value"]["type"], Integer):
+        # Sampled runs store rates, which an INTEGER column would round away
+        conn.execute(text("ALTER TABLE results ALTER COLUMN value TYPE DOUBLE PRECISION"))
+    # create_all only indexes the tables it creates itself
+    for index in results_table.indexes:
+        index.create(conn, checkfirst=True)
+    if "sampled" not in {column["name"] for column in inspect(conn).get_columns("results_daily")}:
+        _add_daily_sampled(conn)
+
+
+def _add_daily_sampled(conn):
+    # Days compacted before sampled was part of the key held full and sampled runs
+    # together; they are kept as full-run rows
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("ALTER TABLE results_daily ADD COLUMN sampled BOOLEAN NOT NULL DEFAULT FALSE"))
+        conn.execute(text(
+            "ALTER TABLE results_daily DROP CONSTRAINT results_daily_pkey, ADD PRIMARY KEY (day, field, metric, sampled)"
+        ))
+        return
+    # SQLite cannot change a primary key in place, so the table is rebuilt
+    conn.execute(text("ALTER TABLE results_daily RENAME TO results_daily_old"))
+    daily_table.create(conn)
+    conn.execute(text("""
+        INSERT INTO results_daily (day, field, metric, sampled, min_value, max_value, avg_value, samples)
+        SELECT day, field, metric, FALSE, min_value, max_value, avg_value, samples FROM results_daily_old
+    """))
+    conn.execute(text("DROP TABLE results_daily_old"))
+
+
+def write_run(
+    conn,
+    run_id: str,
+    results: dict,
+    date: datetime,
+    table_name: str = None,
+    config_hash: str = None,
+    row_count: int = None,
+    duration: float = None,
+    sampled: bool = False
+):
+    """Record one run and all of its metrics with a single batched insert."""
+    conn.execute(
+        insert(runs_table),
+        {
+            "run_id": run_id,
+            "date": date,
+            "table_name": table_name,
+            "config_hash": config_hash,
+            "row_count": row_count,
+            "duration": duration,
+            "sampled": sampled,
+        },
+    )
+    rows = [
+        {"date": date, "field": field_name, "metric": metric, "value": value, "sampled": sampled, "run_id": run_id}
+        for field_name, field_results in results.items()
+        for metric, value in field_results.items()
+    ]
+    if rows:
+        conn.execute(insert(results_table), rows)
+
+
+def write_profile(conn, run_id: str, profiler):
+    """Store a run's profile (see dataops.profiling) next to its metrics."""
+    rows = [
+        {
+            "run_id": run_id, "phase": phase, "field": field_name, "check_name": check,
+            "seconds": seconds, "rows": count, "peak_memory_mb": peak,
+        }
+        for phase, field_name, check, seconds, count, peak in profiler.summary()
+    ]
+    if rows:
+        conn.execute(insert(profiles_table), rows)
+
+
+def compact_results(config: dict, verbose: bool = False, retain_days: int = None) -> int:
+    """Roll raw metrics older than retain_days up into results_daily and delete them.
+
+    Full and sampled runs are rolled up separately. Returns the number of raw
+    rows removed. Days already present in results_daily are merged, so the
+    job is safe to re-run.
+    """
+    logger = setup_logger(verbose, Path(config["log_dir"]) / "data_quality.log")
+    if retain_days is None:
+        retain_days = config.get("quality", {}).get("retain_days", 90)
+    engine = get_engine(config)
+    cutoff = datetime.combine(datetime.now().date() - timedelta(days=retain_days), datetime.min.time())
+    if engine.dialect.name == "sqlite":
+        day, least, greatest, where = "date(date)", "MIN", "MAX", "WHERE true"
+    else:
+        day, least, greatest, where = "CAST(date AS DATE)", "LEAST", "GREATEST", ""
+    with engine.begin() as conn:
+        ensure_schema(conn)
+        conn.execute(
+            text(f"""
+                INSERT INTO results_daily (day, field, metric, sampled, min_value, max_value, avg_value, samples)
+                SELECT * FROM (
+                    SELECT {day} AS day, field, metric, sampled, MIN(value), MAX(value), AVG(value), COUNT(*)
+                    FROM results
+                    WHERE date < :cutoff
+                    GROUP BY {day}, field, metric, sampled
+                ) AS rollup {where}
+                ON CONFLICT (day, field, metric, sampled) DO UPDATE SET
+                    min_value = {least}(results_daily.min_value, excluded.min_value),
+                    max_value = {greatest}(results_daily.max_value, excluded.max_value),
+                    avg_value = (results_daily.avg_value * results_daily.samples + excluded.avg_value * excluded.samples)
+                        / (results_daily.samples + excluded.samples),
+                    samples = results_daily.samples + excluded.samples
+            """),
+            {"cutoff": cutoff},
+        )
+        removed = conn.execute(text("DELETE FROM results WHERE date < :cutoff"), {"cutoff": cutoff}).rowcount
+    logger.info(f"Compacted {removed} raw results older than {cutoff.date()} into results_daily")
+    return removed
@@ -0,0 +1,119 @@
+import math
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from dataops.sources import apply_dtypes, csv_dtypes, db_projection, iter_frames
+
+# Metrics that are per-row rates, so a sample gives an unbiased estimate of them
+RATE_METRICS = ["nulls", "invalid_format", "out_of_range", "non_positive"]
+
+# SQLite's default limit on bound parameters per statement is 999
+_SQLITE_BATCH = 900
+
+
+def wilson_interval(successes: int, n: int, z: float = 1.96) -> tuple:
+    """Wilson score interval for a binomial proportion (95% by default)."""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(center - margin, 0.0), min(center + margin, 1.0)
+
+
+def _reservoir(frames, n: int, rng) -> pd.DataFrame:
+    # Keep the n rows with the smallest random priority seen so far: a uniform
+    # sample without replacement that only ever holds n + chunk rows in memory
+    reservoir = None
+    for df in frames:
+        df = df.assign(_priority=rng.random(len(df)))
+        if reservoir is not None:
+            df = pd.concat([reservoir, df], ignore_index=True)
+        reservoir = df.nsmallest(n, "_priority") if len(df) > n else df
+    if reservoir is None:
+        return pd.DataFrame()
+    return reservoir.drop(columns="_priority").reset_index(drop=True)
+
+
+def _projection(engine, columns: list) -> str:
+    return ", ".join(engine.dialect.identifier_preparer.quote(c) for c in columns) if columns else "*"
+
+
+def _sqlite_sample(engine, table_name: str, n: int, rng, columns: list = None) -> pd.DataFrame:
+    projection = _projection(engine, columns)
+    with engine.connect() as conn:
+        low, high = conn.execute(text(f"SELECT MIN(rowid), MAX(rowid) FROM {table_name}")).one()
+        if low is None:
+            return pd.read_sql(text(f"SELECT {projection} FROM {table_name} LIMIT 0"), conn)
+        span = high - low + 1
+        rowids = (rng.choice(span, size=min(n, span), replace=False) + low).tolist()
+        frames = []
+        for i in range(0, len(rowids), _SQLITE_BATCH):
+            batch = rowids[i:i + _SQLITE_BATCH]
+            params = {f"r{j}": rowid for j, rowid in enumerate(batch)}
+            placeholders = ", ".join(f":{name}" for name in params)
+            frames.append(
+                pd.read_sql(text(f"SELECT {projection} FROM {table_name} WHERE rowid IN ({placeholders})"), conn, params=params)
+            )
+    # Gaps left by deleted rows make the sample a little smaller than n
+    return pd.concat(frames, ignore_index=True)
+
+
+def _postgres_sample(engine, table_name: str, n: int, columns: list = None) -> pd.DataFrame:
+    with engine.connect() as conn:
+        estimate = conn.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = CAST(:table AS regclass)"), {"table": table_name}
+        ).scalar()
+        if not estimate or estimate <= 0:
+            estimate = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar()
+        # Oversample a little so LIMIT rather than chance decides the sample size
+        percent = min(100.0, 100.0 * n * 1.2 / max(estimate, 1))
+        return pd.read_sql(
+            text(f"SELECT {_projection(engine, columns)} FROM {table_name} TABLESAMPLE BERNOULLI (:percent) LIMIT :n"),
+            conn,
+            params={"percent": percent, "n": n},
+        )
+
+
+def sample_frame(
+    source: str,
+    engine,
+    csv_path: str,
+    table_name: str,
+    n: int,
+    chunk_size: int = None,
+    seed: int = None,
+    fields: list = None
+) -> pd.DataFrame:
+    """Draw a random sample of about n rows from the source.
+
+    With fields, a database sample reads only their columns, typed as in a full run.
+    """
+    rng = np.random.default_rng(seed)
+    if source == "csv":
+        if not csv_path or not Path(csv_path).exists():
+            raise ValueError("Valid CSV path required")
+        frames = iter_frames("csv", engine, csv_path, chunk_size=chunk_size or 100_000, dtype=csv_dtypes(fields or []))
+        return _reservoir(frames, n, rng)
+    columns, dtype = db_projection(engine, table_name, fields) if fields else (None, None)
+    if engine.dialect.name == "sqlite":
+        return apply_dtypes(_sqlite_sample(engine, table_name, n, rng, columns), dtype)
+    if engine.dialect.name == "postgresql":
+        return apply_dtypes(_postgres_sample(engine, table_name, n, columns), dtype)
+    frames = iter_frames("db", engine, table_name=table_name, chunk_size=chunk_size or 100_000, columns=columns, dtype=dtype)
+    return _reservoir(frames, n, rng)
+
+
+def add_rate_estimates(results: dict, sample_rows: int) -> dict:
+    """Add <metric>_rate with its 95% interval bounds for every rate metric in results."""
+    for field_results in results.values():
+        for metric in RATE_METRICS:
+            if metric not in field_results:
+                continue
+            low, high = wilson_interval(field_results[metric], sample_rows)
+            field_results[f"{metric}_rate"] = field_results[metric] / sample_rows if sample_rows else 0.0
+            field_results[f"{metric}_rate_low"] = low
+            field_results[f"{metric}_rate_high"] = high
+    return results
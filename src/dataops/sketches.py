@@ -0,0 +1,174 @@
+import math
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype
+
+
+def hash_values(series: pd.Series) -> tuple:
+    """Return (64-bit hashes of the non-null values, null count).
+
+    Integers hash as int64, so large IDs keep every bit. Whole floats hash as
+    the same int64, so 5 and 5.0 from differently typed chunks collide,
+    matching how duplicated() compares them. Hashes are stable across processes.
+    """
+    values = series.dropna()
+    if values.dtype == object:
+        # Python ints from nullable integer columns become int64 again
+        values = values.infer_objects()
+    if is_integer_dtype(values) and not is_bool_dtype(values):
+        return _hash(values.to_numpy(dtype=np.int64)), len(series) - len(values)
+    if is_float_dtype(values):
+        floats = values.to_numpy(dtype=np.float64)
+        whole = (np.mod(floats, 1) == 0) & (np.abs(floats) < 2.0**63)
+        hashes = np.empty(len(floats), dtype=np.uint64)
+        hashes[whole] = _hash(floats[whole].astype(np.int64))
+        hashes[~whole] = _hash(floats[~whole])
+        return hashes, len(series) - len(values)
+    return _hash(values.to_numpy()), len(series) - len(values)
+
+
+def _hash(values: np.ndarray) -> np.ndarray:
+    return pd.util.hash_array(values, categorize=False).astype(np.uint64, copy=False)
+
+
+class HyperLogLog:
+    """Fixed-memory distinct counter with a relative standard error of about ``error``."""
+
+    def __init__(self, error: float = 0.01):
+        self.p = min(max(math.ceil(math.log2((1.04 / error) ** 2)), 4), 18)
+        self.registers = np.zeros(1 << self.p, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray):
+        if not len(hashes):
+            return
+        width = 64 - self.p
+        index = (hashes >> np.uint64(width)).astype(np.int64)
+        rest = hashes & np.uint64((1 << width) - 1)
+        # Rank = position of the leftmost 1-bit in the remaining bits, 1-based
+        _, exponent = np.frexp(rest.astype(np.float64))
+        rank = np.where(rest == 0, width + 1, width - exponent + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while most registers are still empty
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.p]) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        sketch = cls.__new__(cls)
+        sketch.p = data[0]
+        sketch.registers = np.frombuffer(data[1:], dtype=np.uint8).copy()
+        return sketch
+
+
+class BloomFilter:
+    """Fixed-size set membership filter sized for ``capacity`` keys at a false positive rate of ``error``."""
+
+    def __init__(self, capacity: int = 10_000_000, error: float = 0.01):
+        bits = max(int(-capacity * math.log(error) / math.log(2) ** 2), 64)
+        self.bits = (bits + 63) // 64 * 64
+        self.k = max(int(round(self.bits / capacity * math.log(2))), 1)
+        self.words = np.zeros(self.bits // 64, dtype=np.uint64)
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        # Double hashing: k positions from the two 32-bit halves of each hash
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.k, dtype=np.uint64)
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.bits)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        positions = self._positions(hashes)
+        words = self.words[(positions >> np.uint64(6)).astype(np.int64)]
+        return ((words >> (positions & np.uint64(63))) & np.uint64(1)).astype(bool).all(axis=1)
+
+    def add(self, hashes: np.ndarray):
+        positions = self._positions(hashes).ravel()
+        np.bitwise_or.at(
+            self.words, (positions >> np.uint64(6)).astype(np.int64), np.uint64(1) << (positions & np.uint64(63))
+        )
+
+    def merge(self, other: "BloomFilter"):
+        if (other.bits, other.k) != (self.bits, self.k):
+            raise ValueError("Cannot merge Bloom filters of different sizes")
+        np.bitwise_or(self.words, other.words, out=self.words)
+
+    def to_bytes(self) -> bytes:
+        return self.k.to_bytes(1, "little") + self.words.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        bloom = cls.__new__(cls)
+        bloom.k = data[0]
+        bloom.words = np.frombuffer(data[1:], dtype=np.uint64).copy()
+        bloom.bits = len(bloom.words) * 64
+        return bloom
+
+
+class ApproxUniqueCounter:
+    """Fixed-memory stand-in for UniqueCounter.
+
+    Duplicates are counted with a Bloom filter as chunks stream in (false
+    positives only over-count), distinct values with HyperLogLog. Merging two
+    counters adds the values they share, estimated from the merged HLL.
+    """
+
+    spill_path = None
+
+    def __init__(self, error: float = 0.01, capacity: int = 10_000_000):
+        self.hll = HyperLogLog(error)
+        self.bloom = BloomFilter(capacity, error)
+        self.total = 0
+        self.nulls = 0
+        self.seen_duplicates = 0
+
+    def update(self, values: pd.Series):
+        hashes, nulls = hash_values(values)
+        self.total += len(values)
+        # duplicated() treats every null after the first as a duplicate
+        self.seen_duplicates += nulls - (1 if nulls and not self.nulls else 0)
+        self.nulls += nulls
+        if not len(hashes):
+            return
+        in_chunk = pd.Series(hashes).duplicated().to_numpy()
+        first = hashes[~in_chunk]
+        self.seen_duplicates += int(in_chunk.sum()) + int(self.bloom.contains(first).sum())
+        self.bloom.add(first)
+        self.hll.add_hashes(first)
+
+    def merge(self, other: "ApproxUniqueCounter"):
+        union = HyperLogLog.from_bytes(self.hll.to_bytes())
+        union.merge(other.hll)
+        shared = max(self.hll.count() + other.hll.count() - union.count(), 0)
+        shared_null = 1 if self.nulls and other.nulls else 0
+        self.seen_duplicates += other.seen_duplicates + shared + shared_null
+        self.total += other.total
+        self.nulls += other.nulls
+        self.hll = union
+        self.bloom.merge(other.bloom)
+
+    def distinct(self) -> int:
+        return min(self.hll.count(), self.total - self.nulls) + (1 if self.nulls else 0)
+
+    def duplicates(self) -> int:
+        return min(self.seen_duplicates, self.total)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,152 @@
+import importlib.util
+import io
+import sys
+import pandas as pd
+from pathlib import Path
+from sqlalchemy import inspect, text
+
+# Rows read to estimate a table's in-memory size per row
+_ESTIMATE_ROWS = 1000
+
+def field_dtypes(fields: list) -> dict:
+    """pandas dtypes for reading fields from a database.
+
+    A field's ``dtype`` (e.g. category for low-cardinality strings, Int32)
+    wins; otherwise integers load as nullable Int64 and strings as Arrow
+    strings when pyarrow is installed. Apply them with apply_dtypes(), which
+    leaves a column as read when its values do not fit.
+    """
+    pyarrow = importlib.util.find_spec("pyarrow") is not None
+    defaults = {"integer": "Int64", "float": "float64"}
+    if pyarrow:
+        defaults["string"] = "string[pyarrow]"
+    dtypes = {}
+    for field in fields:
+        dtype = field.dtype or defaults.get(field.type)
+        if dtype:
+            dtypes[field.name] = dtype
+    return dtypes
+
+def apply_dtypes(df: pd.DataFrame, dtype: dict) -> pd.DataFrame:
+    """Cast each column to its dtype when the cast is lossless; others keep the type they were read as.
+
+    A 48.5 in an integer column is a bad row for the checks to report, not a
+    reason to fail the read.
+    """
+    for name, column_dtype in (dtype or {}).items():
+        if name in df.columns:
+            try:
+                df[name] = df[name].astype(column_dtype)
+            except (TypeError, ValueError):
+                pass
+    return df
+
+def db_projection(engine, table_name: str, fields: list) -> tuple:
+    """(columns, dtype) for a typed read of only the fields' columns present in the table."""
+    available = set(table_columns(engine, table_name))
+    columns = [field.name for field in fields if field.name in available]
+    dtype = {name: value for name, value in field_dtypes(fields).items() if name in available}
+    return columns, dtype
+
+def csv_dtypes(fields: list) -> dict:
+    """Read string fields as text in every CSV chunk, so "5" is never parsed as 5 in one chunk and kept as text in another."""
+    return {field.name: str for field in fields if field.type == "string"}
+
+def table_columns(engine, table_name: str) -> list:
+    return [column["name"] for column in inspect(engine).get_columns(table_name)]
+
+def plan_db_chunk_size(engine, table_name: str, columns: list, dtype: dict, memory_budget: int) -> int:
+    """Return a chunk size that keeps a typed read of the table under memory_budget bytes,
+    or None when the whole table fits."""
+    projection = ", ".join(engine.dialect.identifier_preparer.quote(c) for c in columns) if columns else "*"
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar()
+        head = apply_dtypes(pd.read_sql(text(f"SELECT {projection} FROM {table_name} LIMIT {_ESTIMATE_ROWS}"), conn), dtype)
+    if head.empty:
+        return None
+    row_bytes = head.memory_usage(deep=True, index=False).sum() / len(head)
+    if rows * row_bytes <= memory_budget:
+        return None
+    return max(int(memory_budget // row_bytes), 1)
+
+def peak_memory_mb() -> float:
+    """Peak resident memory of this process so far, in MB."""
+    try:
+        import resource
+    except ImportError:
+        # Windows has no getrusage, current RSS is the next best thing
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+def iter_frames(
+    source: str,
+    engine,
+    csv_path: str = None,
+    table_name: str = "data_table",
+    chunk_size: int = None,
+    columns: list = None,
+    where: str = None,
+    params: dict = None,
+    dtype: dict = None
+):
+    """Yield the source as DataFrames: one frame, or chunk_size rows at a time.
+
+    dtype applies to CSV and database reads alike; pass csv_dtypes(fields) for
+    CSV. Database columns are cast per chunk with apply_dtypes().
+    """
+    if source == "csv":
+        if not csv_path or not Path(csv_path).exists():
+            raise ValueError("Valid CSV path required")
+        if chunk_size:
+            with pd.read_csv(csv_path, chunksize=chunk_size, usecols=columns, dtype=dtype) as reader:
+                yield from reader
+        else:
+            yield pd.read_csv(csv_path, usecols=columns, dtype=dtype)
+    else:
+        projection = ", ".join(engine.dialect.identifier_preparer.quote(c) for c in columns) if columns else "*"
+        query = text(f"SELECT {projection} FROM {table_name}" + (f" WHERE {where}" if where else ""))
+        if chunk_size:
+            # Server-side cursor so drivers like psycopg2 don't buffer the whole result
+            with engine.connect().execution_options(stream_results=True) as conn:
+                for df in pd.read_sql(query, conn, params=params, chunksize=chunk_size):
+                    yield apply_dtypes(df, dtype)
+        else:
+            with engine.connect() as conn:
+                yield apply_dtypes(pd.read_sql(query, conn, params=params), dtype)
+
+def csv_header(csv_path: str) -> tuple:
+    """Return the column names and the byte offset where the data rows start."""
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        return pd.read_csv(io.BytesIO(header)).columns.tolist(), f.tell()
+
+def iter_csv_range(
+    csv_path: str, start: int, end: int, chunk_size: int = None, columns: list = None, dtype: dict = None
+):
+    """Yield the rows whose first byte falls in [start, end) as DataFrames.
+
+    Ranges are aligned to line boundaries, so quoted fields containing
+    newlines are not supported. start must be past the header line.
+    """
+    names, _ = csv_header(csv_path)
+    def parse(lines):
+        return pd.read_csv(io.BytesIO(b"".join(lines)), header=None, names=names, usecols=columns, dtype=dtype)
+    
+    with open(csv_path, "rb") as f:
+        # Skip the tail of a line that started before this range
+        f.seek(start - 1)
+        f.readline()
+        lines = []
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line)
+            if chunk_size and len(lines) >= chunk_size:
+                yield parse(lines)
+                lines = []
+        if lines:
+            yield parse(lines)
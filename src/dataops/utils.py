@@ -2,10 +2,11 @@ import subprocess
 import psutil
 from pathlib import Path
 from dataops.logging import setup_logger
+from dataops.logtail import follow_log, parse_since, read_log
 import shutil
 
 def start_services(config: dict):
-    logger = setup_logger(False, Path(config["log_dir"]))
+    logger = setup_logger(False, Path(config["log_dir"]) / "services.log")
     project_root = Path.cwd()
     airflow_home = Path(config["airflow"]["home"])
     log_dir = Path(config["log_dir"])
@@ -57,10 +58,15 @@ def check_status(config: dict):
         print(f"{service}: {'Running' if running else 'Stopped'}")
         logger.info(f"{service}: {'Running' if running else 'Stopped'}")
 
-def tail_log(log_file: Path):
+def tail_log(log_file: Path, lines: int = None, follow: bool = False, level: str = None, since: str = None):
     if not log_file.exists():
         raise FileNotFoundError(f"Log file {log_file} does not exist")
-    with open(log_file, "r") as f:
-        lines = f.readlines()[-10:]
-        for line in lines:
-            print(line.strip())
+    since = parse_since(since) if since else None
+    output, offset = read_log(log_file, lines, level, since)
+    for line in output:
+        print(line.decode("utf-8", errors="replace").rstrip())
+    if follow:
+        try:
+            follow_log(log_file, offset, level, since)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,44 @@
+import pickle
+import numpy as np
+import pandas as pd
+from dataops.accumulators import UniqueCounter, normalize_keys
+
+
+def test_nulls_share_one_key_distinct_from_literal_nan():
+    keys = normalize_keys(pd.Series(["a", np.nan, None, pd.NA, "nan"], dtype=object))
+    assert keys[0] == "a" and keys[4] == "nan"
+    assert keys[1] is keys[2] is keys[3]
+    assert keys[1] != "nan"
+
+
+def test_null_key_survives_pickling():
+    key = normalize_keys(pd.Series([None]))[0]
+    assert pickle.loads(pickle.dumps(key)) is key
+
+
+def test_all_null_chunk_matches_full_read():
+    # An all-null chunk reads as object/None, the others as str/NaN
+    full = UniqueCounter()
+    full.update(pd.Series(["x", np.nan, None, "y"], dtype=object))
+    chunked = UniqueCounter()
+    chunked.update(pd.Series([None], dtype=object))
+    chunked.update(pd.Series(["x", np.nan, "y"]))
+    assert full.duplicates() == chunked.duplicates() == 1
+
+
+def test_chunked_and_partitioned_csv_match_full_read(tmp_path):
+    from dataops.logging import setup_logger
+    from dataops.quality import evaluate_quality
+    csv_path = tmp_path / "codes.csv"
+    codes = [str(i) for i in range(100)] + [str(i) for i in range(50)] + ["abc"]
+    csv_path.write_text("code\n" + "\n".join(codes) + "\n")
+    checks_path = tmp_path / "checks.yaml"
+    checks_path.write_text("fields:\n  - name: code\n    type: string\n    checks:\n      unique: true\n")
+    config = {"data_dir": str(tmp_path / "data"), "log_dir": str(tmp_path / "logs"),
+              "database": {"type": "sqlite", "path": str(tmp_path / "db.sqlite")}}
+    logger = setup_logger(False)
+    runs = [
+        evaluate_quality("csv", str(csv_path), config, logger, checks_config_path=str(checks_path), **options)
+        for options in [{}, {"chunk_size": 100}, {"workers": 2}]
+    ]
+    assert [run["results"]["code"]["duplicates"] for run in runs] == [50, 50, 50]
@@ -0,0 +1,35 @@
+import logging
+import pytest
+from dataops import alert
+from dataops.alert import AlertDispatcher
+
+
+class FailingTransport:
+    def send(self, message):
+        raise OSError("server down")
+
+    def close(self):
+        pass
+
+
+def _dispatcher() -> AlertDispatcher:
+    return AlertDispatcher(FailingTransport(), "a@x", ["b@x"], logging.getLogger("test"), digest_window=0, retries=1, backoff=0)
+
+
+def test_failed_delivery_is_recorded_per_submission():
+    dispatcher = _dispatcher()
+    outcome = dispatcher.submit("subject", "body")
+    dispatcher.flush()
+    assert isinstance(outcome.exception(), OSError)
+    assert dispatcher.failed == 1
+    dispatcher.close()
+
+
+def test_send_alert_raises_when_waiting(tmp_path, monkeypatch):
+    monkeypatch.setattr(alert, "build_dispatcher", lambda config, logger: _dispatcher())
+    config = {"log_dir": str(tmp_path), "alerts": {"transport": "failing"}}
+    # Fire-and-forget sends only log the failure
+    alert.send_alert("first", "body", config, False)
+    with pytest.raises(OSError):
+        alert.send_alert("second", "body", config, False, wait=True)
+    alert.close_dispatchers()
@@ -0,0 +1,46 @@
+import pyarrow as pa
+from dataops.arrow_source import iter_arrow_tables
+from dataops.checks import FieldPlan
+
+
+def _evaluate(tmp_path, csv_text: str, checks: str, **options) -> dict:
+    from dataops.logging import setup_logger
+    from dataops.quality import evaluate_quality
+    csv_path = tmp_path / "ids.csv"
+    csv_path.write_text(csv_text)
+    checks_path = tmp_path / "checks.yaml"
+    checks_path.write_text(f"fields:\n  - name: id\n    type: integer\n    checks:\n{checks}")
+    config = {"data_dir": str(tmp_path / "data"), "log_dir": str(tmp_path / "logs"),
+              "database": {"type": "sqlite", "path": str(tmp_path / "db.sqlite")}}
+    return evaluate_quality(
+        "csv", str(csv_path), config, setup_logger(False), checks_config_path=str(checks_path), reader="arrow", **options
+    )["results"]["id"]
+
+
+def test_integers_read_as_int64_and_accept_whole_floats(tmp_path):
+    csv_path = tmp_path / "ids.csv"
+    csv_path.write_text("id,name\n9007199254740993,a\n48.0,b\n,c\n")
+    table, = iter_arrow_tables(str(csv_path), [FieldPlan(name="id", type="integer")])
+    assert table.column("id").type == pa.int64()
+    assert table.column("id").to_pylist() == [9007199254740993, 48, None]
+
+
+def test_large_ids_stay_distinct(tmp_path):
+    ids = "\n".join(str(2**62 + i) for i in range(1000))
+    for options in [{}, {"chunk_size": 100}]:
+        results = _evaluate(tmp_path, f"id\n{ids}\n", "      unique: true\n", **options)
+        assert results["duplicates"] == 0
+
+
+def test_range_bound_past_2_53(tmp_path):
+    results = _evaluate(tmp_path, "id\n1\n9007199254740993\n", f"      range: [0, {2**60}]\n")
+    assert results["out_of_range"] == 0
+
+
+def test_non_whole_integer_is_reported(tmp_path):
+    csv_path = tmp_path / "ids.csv"
+    csv_path.write_text("id\n1\n48.5\n")
+    table, = iter_arrow_tables(str(csv_path), [FieldPlan(name="id", type="integer")])
+    assert table.column("id").to_pylist() == [1, 48.5]
+    for options in [{}, {"chunk_size": 1}]:
+        assert _evaluate(tmp_path, "id\n1\n48.5\n", "      range: [0, 10]\n", **options)["out_of_range"] == 1
@@ -0,0 +1,14 @@
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+from dataops.engines import get_engine
+
+
+def test_in_memory_sqlite_engine():
+    engine = get_engine({"database": {"type": "sqlite", "path": ":memory:", "pool_size": 2}})
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_file_sqlite_engine_uses_pool_size(tmp_path):
+    engine = get_engine({"database": {"type": "sqlite", "path": str(tmp_path / "db.sqlite"), "pool_size": 2}})
+    assert isinstance(engine.pool, QueuePool) and engine.pool.size() == 2
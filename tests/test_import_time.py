@@ -0,0 +1,15 @@
+import importlib.util
+from pathlib import Path
+
+# benchmarks/ is not a package, so the script is loaded from its path
+_spec = importlib.util.spec_from_file_location(
+    "import_time", Path(__file__).resolve().parent.parent / "benchmarks" / "import_time.py"
+)
+import_time = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(import_time)
+
+
+def test_cli_import_skips_heavy_modules():
+    timings = import_time.measure("dataops.cli")
+    assert "dataops.cli" in timings
+    assert sorted(name for name in timings if name in import_time.HEAVY_MODULES) == []
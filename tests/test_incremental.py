@@ -0,0 +1,29 @@
+def _run(tmp_path, csv_path) -> dict:
+    from dataops.logging import setup_logger
+    from dataops.quality import evaluate_quality
+    checks_path = tmp_path / "checks.yaml"
+    checks_path.write_text("fields:\n  - name: value\n    type: integer\n    checks:\n      range: [0, 10]\n")
+    config = {"data_dir": str(tmp_path / "data"), "log_dir": str(tmp_path / "logs"),
+              "database": {"type": "sqlite", "path": str(tmp_path / "db.sqlite")}}
+    run = evaluate_quality(
+        "csv", str(csv_path), config, setup_logger(False), checks_config_path=str(checks_path), incremental=True
+    )
+    return run["rows"], run["results"]["value"]["out_of_range"]
+
+
+def test_appended_rows_are_checked_once(tmp_path):
+    csv_path = tmp_path / "values.csv"
+    csv_path.write_text("value\n" + "5\n" * 100)
+    assert _run(tmp_path, csv_path) == (100, 0)
+    with open(csv_path, "a") as f:
+        f.write("99\n" * 50)
+    assert _run(tmp_path, csv_path) == (50, 50)
+
+
+def test_rewritten_file_is_rescanned(tmp_path):
+    csv_path = tmp_path / "values.csv"
+    csv_path.write_text("value\n" + "5\n" * 100)
+    assert _run(tmp_path, csv_path) == (100, 0)
+    # Larger than before, so the size check alone would read from the old offset
+    csv_path.write_text("value\n" + "99\n" * 150)
+    assert _run(tmp_path, csv_path) == (150, 150)
@@ -0,0 +1,29 @@
+import pytest
+from dataops import parallel
+from dataops.checks import load_plan
+
+
+def test_failed_partition_leaves_no_spill(tmp_path, monkeypatch):
+    from dataops.logging import setup_logger
+    csv_path = tmp_path / "codes.csv"
+    csv_path.write_text("code\n" + "\n".join(str(i % 50) for i in range(400)) + "\n")
+    checks_path = tmp_path / "checks.yaml"
+    checks_path.write_text("fields:\n  - name: code\n    type: string\n    checks:\n      unique: true\n")
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+    read_range = parallel.iter_csv_range
+
+    def failing_first(csv_path, start, *args):
+        if start == len("code\n"):
+            raise OSError("partition 0 failed")
+        return read_range(csv_path, start, *args)
+
+    # Workers are forked, so they see the patched reader
+    monkeypatch.setattr(parallel, "iter_csv_range", failing_first)
+    config = {"data_dir": str(tmp_path), "database": {"type": "sqlite", "path": str(tmp_path / "db.sqlite")}}
+    with pytest.raises(OSError):
+        parallel.run_partitioned(
+            "csv", None, str(csv_path), None, list(load_plan(str(checks_path)).fields), config, 4,
+            setup_logger(False), unique_memory_budget=0, spill_dir=str(spill_dir)
+        )
+    assert list(spill_dir.iterdir()) == []
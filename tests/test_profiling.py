@@ -0,0 +1,32 @@
+from dataops import profiling
+from dataops.profiling import Profiler
+
+
+class Clock:
+    """Stands in for the time module so phase lengths are exact."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+def test_nested_phases_are_not_counted_twice(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(profiling, "time", clock)
+
+    def frames():
+        clock.now += 2
+        yield [1, 2]
+
+    profiler = Profiler(True)
+    with profiler.phase("checks"):
+        for _ in profiler.frames(frames()):
+            clock.now += 1
+        with profiler.phase("load"):
+            clock.now += 4
+    seconds = [(name, elapsed) for name, elapsed, _, _ in profiler.phases]
+    # checks keeps only its own second; the frame load and nested phase are their own rows
+    assert seconds == [("load", 2), ("load", 4), ("checks", 1)]
+    assert sum(elapsed for _, elapsed in seconds) == clock.now
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from dataops import dashboard_queries as queries
+from dataops.engines import get_engine
+from dataops.results import compact_results, ensure_schema, write_run
+
+
+def _config(tmp_path) -> dict:
+    return {"log_dir": str(tmp_path / "logs"), "database": {"type": "sqlite", "path": str(tmp_path / "db.sqlite")}}
+
+
+def test_compaction_keeps_sampled_runs_apart(tmp_path):
+    config = _config(tmp_path)
+    engine = get_engine(config)
+    day = datetime.now() - timedelta(days=100)
+    with engine.begin() as conn:
+        ensure_schema(conn)
+        write_run(conn, "full-1", {"id": {"duplicates": 1714}}, day)
+        write_run(conn, "full-2", {"id": {"duplicates": 1800}}, day + timedelta(hours=1))
+        write_run(conn, "sample", {"id": {"duplicates": 98}}, day + timedelta(hours=2), sampled=True)
+    assert compact_results(config, retain_days=90) == 3
+
+    start, end = day - timedelta(days=1), day + timedelta(days=1)
+    full = queries.metric_series(engine, start, end, ttl=0)
+    sampled = queries.metric_series(engine, start, end, ttl=0, sampled=True)
+    assert (full["min_value"].min(), full["max_value"].max()) == (1714, 1800)
+    assert (sampled["min_value"].min(), sampled["max_value"].max()) == (98, 98)
+
+
+def test_old_daily_table_gains_sampled_key(tmp_path):
+    config = _config(tmp_path)
+    engine = get_engine(config)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE results_daily (day DATE, field VARCHAR(255), metric VARCHAR(255), min_value FLOAT, "
+            "max_value FLOAT, avg_value FLOAT, samples INTEGER, PRIMARY KEY (day, field, metric))"
+        ))
+        conn.execute(text("INSERT INTO results_daily VALUES ('2020-01-01', 'id', 'duplicates', 1, 3, 2, 2)"))
+        ensure_schema(conn)
+        rows = conn.execute(text("SELECT day, sampled, samples FROM results_daily")).all()
+    assert rows == [("2020-01-01", 0, 2)]
@@ -0,0 +1,15 @@
+import pandas as pd
+from dataops.sketches import hash_values
+
+
+def test_large_integers_keep_distinct_hashes():
+    ids = pd.Series([2**62 + i for i in range(1000)], dtype="int64")
+    hashes, nulls = hash_values(ids)
+    assert len(set(hashes.tolist())) == 1000 and nulls == 0
+
+
+def test_int_and_whole_float_chunks_hash_alike():
+    ints, _ = hash_values(pd.Series([5, 7], dtype="int64"))
+    floats, nulls = hash_values(pd.Series([5.0, None, 7.0]))
+    nullable, _ = hash_values(pd.Series([5, None, 7], dtype=object))
+    assert ints.tolist() == floats.tolist() == nullable.tolist() and nulls == 1
@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+from sqlalchemy import text
+from dataops.sources import apply_dtypes
+
+
+def test_apply_dtypes_keeps_columns_that_do_not_fit():
+    df = apply_dtypes(pd.DataFrame({"whole": [1.0, None], "bad": [1.0, 48.5]}), {"whole": "Int64", "bad": "Int64"})
+    assert str(df["whole"].dtype) == "Int64"
+    assert df["bad"].tolist() == [1.0, 48.5]
+
+
+@pytest.mark.parametrize("options", [{}, {"chunk_size": 2}, {"workers": 2}, {"pushdown": True}, {"incremental": True}, {"sample": 10}])
+def test_bad_integer_in_database_is_reported(tmp_path, options):
+    from dataops.engines import get_engine
+    from dataops.logging import setup_logger
+    from dataops.quality import evaluate_quality
+    config = {"data_dir": str(tmp_path / "data"), "log_dir": str(tmp_path / "logs"),
+              "database": {"type": "sqlite", "path": str(tmp_path / "db.sqlite")}}
+    with get_engine(config).begin() as conn:
+        conn.execute(text("CREATE TABLE data_table (age INTEGER, name TEXT)"))
+        conn.execute(text("INSERT INTO data_table VALUES (1, 'a'), (48.5, 'b'), (7, 'c'), (200, 'd')"))
+    checks_path = tmp_path / "checks.yaml"
+    checks_path.write_text("fields:\n  - name: age\n    type: integer\n    checks:\n      range: [0, 100]\n")
+    run = evaluate_quality(
+        "db", None, config, setup_logger(False), table_name="data_table", checks_config_path=str(checks_path), **options
+    )
+    assert run["results"]["age"]["out_of_range"] == 1